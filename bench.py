@@ -0,0 +1,189 @@
+import argparse
+import json
+import operator
+import gc
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from data_type import *
+
+# Benchmark every Number operator over every type pair.
+#
+#   python bench.py --output results.json
+#   python bench.py --output new.json --compare results.json --threshold 0.2
+#
+# ns/op is reported for the data_type operands and for the same values as
+# native Python scalars and as numpy scalars/arrays. --compare flags every
+# case that got slower than the old results file by more than --threshold,
+# after discounting the median slowdown shared by all cases.
+
+OPERATORS = {
+    "arithmetic": {
+        "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+        "//": operator.floordiv, "%": operator.mod, "**": operator.pow,
+    },
+    "inplace": {
+        "+=": operator.iadd, "-=": operator.isub, "*=": operator.imul, "/=": operator.itruediv,
+        "//=": operator.ifloordiv, "%=": operator.imod, "**=": operator.ipow,
+        "<<=": operator.ilshift, ">>=": operator.irshift,
+        "&=": operator.iand, "|=": operator.ior, "^=": operator.ixor,
+    },
+    "bitwise": {
+        "&": operator.and_, "|": operator.or_, "^": operator.xor,
+        "<<": operator.lshift, ">>": operator.rshift,
+    },
+    "comparison": {
+        "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+        "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    },
+}
+
+# name -> (make typed operand, native Python value, numpy value)
+TYPES = {
+    "Boolean": (lambda v: Boolean(v), lambda v: bool(v), lambda v: np.bool_(v)),
+    "Integer8": (Integer8, int, np.int8),
+    "Integer16": (Integer16, int, np.int16),
+    "Integer32": (Integer32, int, np.int32),
+    "Integer64": (Integer64, int, np.int64),
+    "UnsignedInteger8": (UnsignedInteger8, int, np.uint8),
+    "UnsignedInteger16": (UnsignedInteger16, int, np.uint16),
+    "UnsignedInteger32": (UnsignedInteger32, int, np.uint32),
+    "UnsignedInteger64": (UnsignedInteger64, int, np.uint64),
+    "Real32": (Real32, float, np.float32),
+    "Real64": (Real64, float, np.float64),
+    "Complex64": (Complex64, complex, np.complex64),
+    "Complex128": (Complex128, complex, np.complex128),
+    "Vector": (lambda v: Vector([v, v + 1, v + 2]), None, lambda v: np.array([v, v + 1, v + 2])),
+}
+
+LEFT_VALUE = 7
+RIGHT_VALUE = 3
+
+
+def copy_operand(value):
+    if isinstance(value, Vector):
+        return Vector(value.value)
+    elif isinstance(value, Number):
+        return type(value)(value.raw_value)
+    elif isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+
+def time_case(op, left, right, number, repeat, inplace):
+    """Return the best ns per call of `op(left, right)` over `repeat` runs, or None when it raises."""
+    try:
+        op(copy_operand(left), copy_operand(right))
+    except Exception:
+        return None
+    best = None
+    for _ in range(repeat):
+        if inplace:
+            # in-place operators may mutate either operand, so every call gets fresh copies
+            pairs = [(copy_operand(left), copy_operand(right)) for _ in range(number)]
+        else:
+            pairs = [(left, right)] * number
+        gc.disable()
+        start = time.perf_counter_ns()
+        for x, y in pairs:
+            op(x, y)
+        elapsed = (time.perf_counter_ns() - start) / number
+        gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(number, repeat):
+    results = {}
+    with np.errstate(all="ignore"):
+        for group, operators in OPERATORS.items():
+            inplace = group == "inplace"
+            for symbol, op in operators.items():
+                for left_name, (make_left, native_left, numpy_left) in TYPES.items():
+                    for right_name, (make_right, native_right, numpy_right) in TYPES.items():
+                        case = {
+                            "group": group,
+                            "ns": time_case(op, make_left(LEFT_VALUE), make_right(RIGHT_VALUE), number, repeat, inplace),
+                            "numpy_ns": time_case(op, numpy_left(LEFT_VALUE), numpy_right(RIGHT_VALUE), number, repeat, inplace),
+                            "native_ns": None,
+                        }
+                        if native_left is not None and native_right is not None:
+                            case["native_ns"] = time_case(
+                                op, native_left(LEFT_VALUE), native_right(RIGHT_VALUE), number, repeat, inplace)
+                        results[f"{left_name} {symbol} {right_name}"] = case
+    return results
+
+
+def compare(old, new, threshold):
+    """Return `(drift, regressions)` between two result sets.
+
+    `drift` is the median new/old ratio over all cases; it absorbs machine-wide
+    speed differences between the two runs. A case is a regression when its own
+    ratio exceeds that drift by more than `threshold`, or when it worked before
+    and now raises (its new ns is None).
+    """
+    ratios = {}
+    regressions = []
+    for case, result in new.items():
+        before = old.get(case, {}).get("ns")
+        after = result["ns"]
+        if before is not None and after is None:
+            regressions.append((case, before, None))
+        elif before and after:
+            ratios[case] = after / before
+    if not ratios:
+        return 1.0, regressions
+    drift = statistics.median(ratios.values())
+    regressions += [(case, old[case]["ns"], new[case]["ns"])
+                    for case, ratio in ratios.items() if ratio / drift - 1 > threshold]
+    return drift, regressions
+
+
+def format_ns(value):
+    return "error" if value is None else f"{value:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data_type operators over every type pair.")
+    parser.add_argument("--number", type=int, default=100, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case, the best one is kept")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="previous JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--quiet", action="store_true", help="do not print every case")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    if not args.quiet:
+        print(f"{'case':<48}{'ns/op':>10}{'native':>10}{'numpy':>10}")
+        for case, result in results.items():
+            print(f"{case:<48}{format_ns(result['ns']):>10}"
+                  f"{format_ns(result['native_ns']):>10}{format_ns(result['numpy_ns']):>10}")
+
+    if args.output:
+        meta = {"python": platform.python_version(), "numpy": np.__version__,
+                "number": args.number, "repeat": args.repeat}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)["results"]
+        drift, regressions = compare(old, results, args.threshold)
+        print(f"median drift against {args.compare}: {drift - 1:+.0%}")
+        for case, before, after in regressions:
+            if after is None:
+                print(f"REGRESSION {case}: {before:.0f} ns/op -> now raises")
+            else:
+                print(f"REGRESSION {case}: {before:.0f} -> {after:.0f} ns/op ({after / before - 1:+.0%})")
+        print(f"{len(regressions)} regression(s): new errors or slowdowns over {args.threshold:.0%}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
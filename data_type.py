@@ -1,1141 +1,3253 @@
-import numpy as np
-
-
-class UnsupportedTypeError(TypeError):
-    def __init__(self, operand_type):
-        self.message = f"Unsupported operand type: {operand_type}"
-        super().__init__(self.message)
-
-
-class CastError(TypeError):
-    def __init__(self, from_type, to_type):
-        self.message = f"Cannot cast `{from_type}` to `{to_type}`"
-        super().__init__(self.message)
-
-
-def get_np_type(value: np.ndarray) -> str:
-    if value.dtype == np.bool_:
-        return "bool"
-    elif value.dtype == np.int8:
-        return "int8"
-    elif value.dtype == np.int16:
-        return "int16"
-    elif value.dtype == np.int32:
-        return "int32"
-    elif value.dtype == np.int64:
-        return "int64"
-    elif value.dtype == np.uint8:
-        return "uint8"
-    elif value.dtype == np.uint16:
-        return "uint16"
-    elif value.dtype == np.uint32:
-        return "uint32"
-    elif value.dtype == np.uint64:
-        return "uint64"
-    elif value.dtype == np.float16:
-        return "float16"
-    elif value.dtype == np.float32:
-        return "float32"
-    elif value.dtype == np.float64:
-        return "float64"
-    elif value.dtype == np.complex64:
-        return "complex64"
-    elif value.dtype == np.complex128:
-        return "complex128"
-    else:
-        raise TypeError(f"Unsupported type: {value.dtype}")
-
-
-def is_np_bool(value: np.ndarray) -> bool:
-    if not isinstance(value, np.ndarray):
-        return False
-    if value.shape != ():
-        return False
-    return get_np_type(value) == "bool"
-
-
-def is_np_int(value: np.ndarray) -> bool:
-    if not isinstance(value, np.ndarray):
-        return False
-    if value.shape != ():
-        return False
-    return get_np_type(value) in ["int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64"]
-
-
-def is_np_float(value: np.ndarray) -> bool:
-    if not isinstance(value, np.ndarray):
-        return False
-    if value.shape != ():
-        return False
-    return get_np_type(value) in ["float16", "float32", "float64"]
-
-
-def is_np_complex(value: np.ndarray) -> bool:
-    if not isinstance(value, np.ndarray):
-        return False
-    if value.shape != ():
-        return False
-    return get_np_type(value) in ["complex64", "complex128"]
-
-
-class Generic:
-    def __init__(self, value):
-        self.value = value
-
-    def __add__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for +: '{type(self)}' and '{type(other)}')")
-
-    def __radd__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for +: '{type(other)}' and '{type(self)}')")
-
-    def __sub__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for -: '{type(self)}' and '{type(other)}')")
-
-    def __rsub__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for -: '{type(other)}' and '{type(self)}')")
-
-    def __mul__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for *: '{type(self)}' and '{type(other)}')")
-
-    def __rmul__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for *: '{type(other)}' and '{type(self)}')")
-
-    def __truediv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
-
-    def __rtruediv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for /: '{type(other)}' and '{type(self)}')")
-
-    def __floordiv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
-
-    def __rfloordiv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for //: '{type(other)}' and '{type(self)}')")
-
-    def __mod__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
-
-    def __rmod__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for %: '{type(other)}' and '{type(self)}')")
-
-    def __pow__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for **: '{type(self)}' and '{type(other)}')")
-
-    def __rpow__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for **: '{type(other)}' and '{type(self)}')")
-
-    def __neg__(self):
-        raise TypeError(f"Bad operand type for unary -: '{type(self)}'")
-
-    def __pos__(self):
-        raise TypeError(f"Bad operand type for unary +: '{type(self)}'")
-
-    def __abs__(self):
-        raise TypeError(f"Bad operand type for abs(): '{type(self)}'")
-
-    def __invert__(self):
-        raise TypeError(f"Bad operand type for unary ~: '{type(self)}'")
-
-    def __iadd__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for +=: '{type(self)}' and '{type(other)}')")
-
-    def __isub__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for -=: '{type(self)}' and '{type(other)}')")
-
-    def __imul__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for *=: '{type(self)}' and '{type(other)}')")
-
-    def __itruediv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for /=: '{type(self)}' and '{type(other)}')")
-
-    def __ifloordiv__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for //=: '{type(self)}' and '{type(other)}')")
-
-    def __imod__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for %=: '{type(self)}' and '{type(other)}')")
-
-    def __ipow__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for **=: '{type(self)}' and '{type(other)}')")
-
-    def __ilshift__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for <<=: '{type(self)}' and '{type(other)}')")
-
-    def __irshift__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for >>=: '{type(self)}' and '{type(other)}')")
-
-    def __iand__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for &=: '{type(self)}' and '{type(other)}')")
-
-    def __ixor__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for ^=: '{type(self)}' and '{type(other)}')")
-
-    def __ior__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for |=: '{type(self)}' and '{type(other)}')")
-
-    def __eq__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for ==: '{type(self)}' and '{type(other)}')")
-
-    def __ne__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for !=: '{type(self)}' and '{type(other)}')")
-
-    def __lt__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for <: '{type(self)}' and '{type(other)}')")
-
-    def __gt__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for >: '{type(self)}' and '{type(other)}')")
-
-    def __le__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for <=: '{type(self)}' and '{type(other)}')")
-
-    def __ge__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for >=: '{type(self)}' and '{type(other)}')")
-
-    def __and__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for &: '{type(self)}' and '{type(other)}')")
-
-    def __or__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for |: '{type(self)}' and '{type(other)}')")
-
-    def __xor__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for ^: '{type(self)}' and '{type(other)}')")
-
-    def __lshift__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
-
-    def __rshift__(self, other):
-        raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
-
-    def __int__(self):
-        return int(self.value)
-
-    def __float__(self):
-        return float(self.value)
-
-    def __complex__(self):
-        return complex(self.value)
-
-    def __str__(self):
-        return str(self.value)
-
-    def __bool__(self):
-        return bool(self.value)
-
-    # repr() function =====
-    def __repr__(self):
-        return f"Generic({self.value})"
-
-    # hash() function =====
-    def __hash__(self):
-        return hash(self.value)
-
-    def __bytes__(self):
-        return bytes(self.value) 
-
-
-class String(Generic):
-    def __init__(self, value):
-        self.value = str(value)
-
-    def __add__(self, other):
-        if isinstance(other, (String, str)):
-            return type(self)(self.value + other)
-        else:
-            super().__add__(other)
-
-    def __radd__(self, other):
-        if isinstance(other, (String, str)):
-            return type(self)(other + self.value)
-        else:
-            super().__radd__(other)
-
-def string(value):
-    return String(value)
-
-
-class Number(Generic):
-    priority = 0  # Default priority
-
-    def __init__(self, value):
-        self.raw_value = value
-        self.value = np.array(value)
-        if self.value.shape != ():  # If value is not a scalar
-            raise ValueError("Value must be a scalar")
-
-    def cast(self, other):
-        if isinstance(other, int) or is_np_int(other):
-            return self, Integer(other)
-        elif isinstance(other, float) or is_np_float(other):
-            return self, Real(other)
-        elif isinstance(other, complex) or is_np_complex(other):
-            return self, Complex(other)
-        elif isinstance(other, bool) or is_np_bool(other):
-            return self, Boolean(other)
-        elif isinstance(other, list):
-            return self, Vector(other)
-        elif isinstance(other, Vector):
-            return self, other
-        elif isinstance(other, Number):
-            if other.priority > self.priority:
-                return other.cast(self)
-            return self, type(self)(other.value)
-        else:
-            raise UnsupportedTypeError(type(other))
-
-    # ==============================
-    # arithmetic operations
-    # ==============================
-    # + operator =====
-    def __add__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        return type(self)(self.value + other.value)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    # - operator =====
-    def __sub__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        return type(self)(self.value - other.value)
-
-    def __rsub__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        return type(self)(other.value - self.value)
-
-    # * operator =====
-    def __mul__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        return type(self)(self.value * other.value)
-
-    def __rmul__(self, other):
-        return self.__mul__(other)
-
-    # / operator =====
-    def __truediv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if other.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex) :
-            return Complex(self.value / other.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(self.value / other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
-
-    def __rtruediv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if self.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(other.value / self.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(other.value / self.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
-
-    # // operator =====
-    def __floordiv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if self.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(self.value // other.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(self.value // other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
-
-    def __rfloordiv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if self.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(other.value // self.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(other.value // self.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
-
-    # % operator =====
-    def __mod__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if other.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(self.value % other.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(self.value % other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
-
-    def __rmod__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if self.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(other.value % self.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(other.value % self.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
-
-    # ** operator =====
-    def __pow__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Complex) or isinstance(other, Complex):
-            return Complex(self.value ** other.value)
-        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
-            return Real(self.value ** other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for **: '{type(self)}' and '{type(other)}')")
-
-    def __rpow__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        return type(self)(other.value ** self.value)
-
-    # ==============================
-    # unary operator
-    # ==============================
-    # - operator =====
-    def __neg__(self):
-        return type(self)(-self.value)
-
-    # + operator =====
-    def __pos__(self):
-        return type(self)(self.value)
-
-    # abs() function =====
-    def __abs__(self):
-        return type(self)(abs(self.value))
-
-    # ~ operator =====
-    def __invert__(self):
-        return type(self)(~self.value)
-
-    # ==============================
-    # inplace
-    # ==============================
-    # += operator =====
-    def __iadd__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(other, (Integer, Real, Complex)):
-            self.value += other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for +=: '{type(self)}' and '{type(other)}')")
-
-    # -= operator =====
-    def __isub__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(other, (Integer, Real, Complex)):
-            self.value -= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for -=: '{type(self)}' and '{type(other)}')")
-
-    # *= operator =====
-    def __imul__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(other, (Integer, Real, Complex)):
-            self.value *= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for *=: '{type(self)}' and '{type(other)}')")
-
-    # /= operator =====
-    def __itruediv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if other.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        if isinstance(self, Integer):
-            self = Real(self.value)
-        self.value /= other.value
-        return self
-
-    # //= operator =====
-    def __ifloordiv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if other.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        self.value //= other.value
-        return self
-
-    # %= operator =====
-    def __imod__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if other.value == 0:
-            raise ZeroDivisionError("Division by zero")
-        self.value %= other.value
-        return self
-
-    # **= operator =====
-    def __ipow__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        self.value **= other.value
-        return self
-
-    # <<= operator =====
-    def __ilshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
-            self.value <<= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for <<=: '{type(self)}' and '{type(other)}')")
-
-    # >>= operator =====
-    def __irshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
-            self.value >>= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for >>=: '{type(self)}' and '{type(other)}')")
-
-    # &= operator =====
-    def __iand__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
-            self.value &= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for &=: '{type(self)}' and '{type(other)}')")
-
-    # ^= operator =====
-    def __ixor__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
-            self.value ^= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for ^=: '{type(self)}' and '{type(other)}')")
-
-    # |= operator =====
-    def __ior__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
-            self = Integer(self.value)
-        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
-            self.value |= other.value
-            return self
-        else:
-            raise TypeError(f"Unsupported operand type(s) for |=: '{type(self)}' and '{type(other)}')")
-
-    # ==============================
-    # comparison operations
-    # ==============================
-    def __eq__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value == other.value)
-        return Boolean(self.value == other.value)
-
-    def __ne__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value != other.value)
-        return Boolean(self.value != other.value)
-
-    def __lt__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value < other.value)
-        return Boolean(self.value < other.value)
-
-    def __gt__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value > other.value)
-        return Boolean(self.value > other.value)
-
-    def __le__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value <= other.value)
-        return Boolean(self.value <= other.value)
-
-    def __ge__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value >= other.value)
-        return Boolean(self.value >= other.value)
-
-    # ==============================
-    # bitwise operations
-    # ==============================
-    # & operator =====
-    def __and__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(self.value & other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for &: '{type(self)}' and '{type(other)}')")
-
-    def __rand__(self, other):
-        return self.__and__(other)
-
-    # | operator =====
-    def __or__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(self.value | other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for |: '{type(self)}' and '{type(other)}')")
-
-    def __ror__(self, other):
-        return self.__or__(other)
-
-    # ^ operator =====
-    def __xor__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(self.value ^ other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for ^: '{type(self)}' and '{type(other)}')")
-
-    def __rxor__(self, other):
-        return self.__xor__(other)
-
-    # << operator =====
-    def __lshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(self.value << other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
-
-    def __rlshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(other << self.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
-
-    # >> operator =====
-    def __rshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(self.value >> other.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
-
-    def __rrshift__(self, other):
-        self, other = self.cast(other)
-        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
-            return Integer(other.value >> self.value)
-        else:
-            raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
-
-    # ==============================
-    # other
-    # ==============================
-    # repr() function =====
-    def __repr__(self):
-        return f"Number({self.value})"
-
-
-    def __int__(self):
-        return int(self.value)
-
-    def __float__(self):
-        return float(self.value)
-
-    def __complex__(self):
-        return complex(self.value)
-
-    def __str__(self):
-        return str(self.value)
-
-    def __bool__(self):
-        return bool(self.value)
-
-
-class Boolean(Number):
-    priority = 0
-
-    def __init__(self, value):
-        if isinstance(value, str):
-            try:
-                value = int(float(value))
-                super().__init__(value)
-                return
-            except ValueError:
-                pass
-            value = int(not value.lower() in ["false", "0"])
-        elif isinstance(value, Number):
-            if isinstance(value, Boolean):
-                value = value.value
-            elif isinstance(value, (Integer, Real, Complex)):
-                value = int(bool(value.value))
-            elif isinstance(value, Vector):
-                value = int(np.all(value.value))
-            else:
-                raise CastError(type(value), type(self))
-        else:
-            try:
-                value = int(bool(value))
-            except ValueError:
-                raise ValueError("Value must be convertible to a boolean")
-        super().__init__(value)
-
-    def __repr__(self):
-        return f"Boolean({self.value})"
-
-def boolean(value):
-    return Boolean(value)
-
-
-class Integer(Number):
-    priority = 1
-
-    def __init__(self, value):
-        self.base = 10
-        if isinstance(value, str):
-            try:
-                # value = int(value)
-                value = np.array(int(value))
-            except ValueError:
-                raise ValueError("Value must be an integer")
-        elif isinstance(value, Number):
-            if isinstance(value, Integer):
-                value = value.value
-            elif isinstance(value, Complex) or isinstance(value, complex) or is_np_complex(value):
-                raise CastError(type(value).__name__, type(self).__name__)
-            elif isinstance(value, Vector):
-                raise CastError(type(value).__name__, type(self).__name__)
-            else:
-                # value = int(value.value)
-                value = np.array(int(value.value))
-        else:
-            try:
-                # value = int(value)
-                value = np.array(int(value))
-            except ValueError:
-                raise ValueError("Value must be an integer")
-        super().__init__(value)
-
-    def to_int8(self):
-        return Integer(np.int8(self.value))
-
-    def to_int16(self):
-        return Integer(np.int16(self.value))
-
-    def to_int32(self):
-        return Integer(np.int32(self.value))
-
-    def to_int64(self):
-        return Integer(np.int64(self.value))
-
-    def to_uint8(self):
-        return Integer(np.uint8(self.value))
-
-    def to_uint16(self):
-        return Integer(np.uint16(self.value))
-
-    def to_uint32(self):
-        return Integer(np.uint32(self.value))
-
-    def to_uint64(self):
-        return Integer(np.uint64(self.value))
-
-    def __iter__(self):
-        return iter(range(self.value))
-
-    def __repr__(self):
-        return f"Integer({self.value})"
-
-class Integer8(Integer):
-    def __init__(self, value):
-        super().__init__(np.int8(value))
-
-class Integer16(Integer):
-    def __init__(self, value):
-        super().__init__(np.int16(value))
-
-class Integer32(Integer):
-    def __init__(self, value):
-        super().__init__(np.int32(value))
-
-class Integer64(Integer):
-    def __init__(self, value):
-        super().__init__(np.int64(value))
-
-class UnsignedInteger8(Integer):
-    def __init__(self, value):
-        super().__init__(np.uint8(value))
-
-class UnsignedInteger16(Integer):
-    def __init__(self, value):
-        super().__init__(np.uint16(value))
-
-class UnsignedInteger32(Integer):
-    def __init__(self, value):
-        super().__init__(np.uint32(value))
-
-class UnsignedInteger64(Integer):
-    def __init__(self, value):
-        super().__init__(np.uint64(value))
-
-def integer(value):
-    return Integer(value)
-
-def int8(value):
-    return Integer8(np.int8(value))
-
-def int16(value):
-    return Integer16(np.int16(value))
-
-def int32(value):
-    return Integer32(np.int32(value))
-
-def int64(value):
-    return Integer64(np.int64(value))
-
-def uint8(value):
-    return UnsignedInteger8(np.uint8(value))
-
-def uint16(value):
-    return UnsignedInteger16(np.uint16(value))
-
-def uint32(value):
-    return UnsignedInteger32(np.uint32(value))
-
-def uint64(value):
-    return UnsignedInteger64(np.uint64(value))
-
-
-class Real(Number):
-    priority = 2
-
-    def __init__(self, value):
-        if isinstance(value, str):
-            try:
-                # value = float(value)
-                value = np.array(float(value))
-            except ValueError:
-                raise ValueError("Value must be a real number")
-        elif isinstance(value, Number):
-            if isinstance(value, Real):
-                value = value.value
-            # elif isinstance(value, (Complex, complex)):
-            elif isinstance(value, Complex) or isinstance(value, complex) or is_np_complex(value):
-                raise CastError(type(value).__name__, type(self).__name__)
-            elif isinstance(value, Vector):
-                raise CastError(type(value).__name__, type(self).__name__)
-            else:
-                # value = float(value.value)
-                value = np.array(float(value.value))
-        else:
-            # value = float(value)
-            value = np.array(float(value))
-        super().__init__(value)
-
-    def __repr__(self):
-        return f"Real({self.value})"
-
-
-class Real32(Real):
-    def __init__(self, value):
-        super().__init__(np.float32(value))
-
-
-class Real64(Real):
-    def __init__(self, value):
-        super().__init__(np.float64(value))
-
-
-def real(value):
-    return Real(value)
-
-def real32(value):
-    return Real32(np.float32(value))
-
-def real64(value):
-    return Real64(np.float64(value))
-
-
-class Complex(Number):
-    priority = 3
-
-    def __init__(self, value):
-        if isinstance(value, str):
-            try:
-                # value = complex(value)
-                value = np.array(complex(value))
-            except ValueError:
-                raise ValueError("Value must be a complex number")
-        elif isinstance(value, Number):
-            if isinstance(value, Complex):
-                value = value.value
-            elif isinstance(value, Vector):
-                raise CastError(type(value).__name__, type(self).__name__)
-            else:
-                # value = complex(value.value)
-                value = np.array(complex(value.value))
-        else:
-            try:
-                # value = complex(value)
-                value = np.array(complex(value))
-            except ValueError:
-                raise ValueError("Value must be a complex number")
-        self.real = Real(value.real)
-        self.imag = Real(value.imag)
-        super().__init__(value)
-
-    def __repr__(self):
-        return f"Complex({self.value})"
-
-
-class Complex64(Complex):
-    def __init__(self, value):
-        super().__init__(np.complex64(value))
-
-
-class Complex128(Complex):
-    def __init__(self, value):
-        super().__init__(np.complex128(value))
-
-
-def imag(value):
-    return Complex(value)
-
-def imag64(value):
-    return Complex(np.complex64(value))
-
-def imag128(value):
-    return Complex(np.complex128(value))
-
-
-class Vector(Number):
-    def __init__(self, value: list | np.ndarray):
-        # self.value = value
-        self.value = np.array(value)
-        if self.value.shape == ():
-            raise ValueError("Vector must have at least one dimension")
-
-    def __truediv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(self.value / other.value)
-        else:
-            return Vector(self.value / other)
-
-    def __rtruediv__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, Vector):
-            return Vector(other.value / self.value)
-        else:
-            return Vector(other / self.value)
-
-    def __eq__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value == other.value)
-        else:
-            return Vector(self.value == other)
-
-    def __ne__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value != other.value)
-        else:
-            return Vector(self.value != other)
-
-    def __ge__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value >= other.value)
-        else:
-            return Vector(self.value >= other)
-
-    def __gt__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value > other.value)
-        else:
-            return Vector(self.value > other)
-
-    def __le__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value <= other.value)
-        else:
-            return Vector(self.value <= other)
-
-    def __lt__(self, other):
-        self, other = self.cast(other)
-        if isinstance(other, (Vector, Number)):
-            return Vector(self.value < other.value)
-        else:
-            return Vector(self.value < other)
-
-    def __repr__(self):
-        return f"Vector({self.value})"
-
-    def __getitem__(self, item):
-        return self.value[item]
-
-    def __setitem__(self, key, value):
-        self.value[key] = value
-
-    def __len__(self):
-        return len(self.value)
-
-    def __iter__(self):
-        return iter(self.value)
-
-    def __next__(self):
-        return next(self.value)
-
-    def __contains__(self, item):
-        return item in self.value
-
-    def __index__(self):
-        return self.value.__index__()
-
-    def __reversed__(self):
-        return reversed(self.value)
-
-    def all(self):
-        return Boolean(np.all(self.value))
-
-    def dot(self, other):
-        self, other = self.cast(other)
-        return Vector(np.dot(self.value, other.value))
-
-    def eig(self):
-        return np.linalg.eig(self.value)
-
-    @property
-    def shape(self):
-        return self.value.shape
-
-    @property
-    def rank(self):
-        return np.linalg.matrix_rank(self.value)
-
-    @property
-    def norm(self):
-        return Real(np.linalg.norm(self.value))
-
-    @property
-    def T(self):
-        return Vector(self.value.T)
-
-def vec(value):
-    return Vector(value)
-
-def dot(a: Vector, b: Vector) -> Vector:
-    return a.dot(b)
-
-
-class Tuple(Generic):
-    def __init__(self, value: list | tuple):
-        self.value = tuple(value)
-
-    def __repr__(self):
-        return f"Tuple({self.value})"
-
-    def __getitem__(self, item):
-        return self.value[item]
-
-    def __setitem__(self, key, value):
-        self.value[key] = value
-
-    def __len__(self):
-        return len(self.value)
-
-    def __iter__(self):
-        return iter(self.value)
-
-    def __next__(self):
-        return next(self.value)
-
-    def __contains__(self, item):
-        return item in self.value
-
-    def __index__(self):
-        return self.value.__index__()
-
-    def __reversed__(self):
-        return reversed(self.value)
-
-
-class Undefined:
-    def __init__(self, symbol):
-        self.symbol = symbol
-
-    def __repr__(self):
-        return "Undefined symbol: " + self.symbol
-
-
-class Operator:
-    def __init__(self, symbol):
-        self.symbol = symbol
-
-    def __repr__(self):
-        return f"Operator({self.symbol})"
-
-
-def autotype(value: int | float | bool | complex | str | list):
-    if isinstance(value, int) or is_np_int(value):
-        return Integer(value)
-    elif isinstance(value, float) or is_np_float(value):
-        return Real(value)
-    elif isinstance(value, complex) or is_np_complex(value):
-        return Complex(value)
-    elif isinstance(value, bool) or is_np_bool(value):
-        return Boolean(value)
-    elif isinstance(value, str):
-        return String(value)
-    elif isinstance(value, list):
-        return Vector(value)
-    # elif isinstance(value, tuple):
-    #     return Tuple(value)
-    else:
-        raise TypeError(f"Unsupported type: {type(value)}")
\ No newline at end of file
+import contextlib
+import functools
+import inspect
+import io
+import math
+import operator
+import os
+import struct
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+
+class UnsupportedTypeError(TypeError):
+    def __init__(self, operand_type):
+        self.message = f"Unsupported operand type: {operand_type}"
+        super().__init__(self.message)
+
+
+class CastError(TypeError):
+    def __init__(self, from_type, to_type):
+        self.message = f"Cannot cast `{from_type}` to `{to_type}`"
+        super().__init__(self.message)
+
+
+class DeferredOperand(Exception):
+    """Raised by `Number.cast` when the other operand implements the operator itself (see `Undefined`, `Vector`)."""
+
+
+NP_TYPE_NAMES = {
+    np.dtype(np.bool_): "bool",
+    np.dtype(np.int8): "int8",
+    np.dtype(np.int16): "int16",
+    np.dtype(np.int32): "int32",
+    np.dtype(np.int64): "int64",
+    np.dtype(np.uint8): "uint8",
+    np.dtype(np.uint16): "uint16",
+    np.dtype(np.uint32): "uint32",
+    np.dtype(np.uint64): "uint64",
+    np.dtype(np.float16): "float16",
+    np.dtype(np.float32): "float32",
+    np.dtype(np.float64): "float64",
+    np.dtype(np.complex64): "complex64",
+    np.dtype(np.complex128): "complex128",
+}
+
+
+def get_np_type(value: np.ndarray) -> str:
+    try:
+        return NP_TYPE_NAMES[value.dtype]
+    except KeyError:
+        raise TypeError(f"Unsupported type: {value.dtype}")
+
+
+def is_np_bool(value: np.ndarray) -> bool:
+    if not isinstance(value, np.ndarray):
+        return False
+    if value.shape != ():
+        return False
+    return get_np_type(value) == "bool"
+
+
+def is_np_int(value: np.ndarray) -> bool:
+    if not isinstance(value, np.ndarray):
+        return False
+    if value.shape != ():
+        return False
+    return get_np_type(value) in ["int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64"]
+
+
+def is_np_float(value: np.ndarray) -> bool:
+    if not isinstance(value, np.ndarray):
+        return False
+    if value.shape != ():
+        return False
+    return get_np_type(value) in ["float16", "float32", "float64"]
+
+
+def is_np_complex(value: np.ndarray) -> bool:
+    if not isinstance(value, np.ndarray):
+        return False
+    if value.shape != ():
+        return False
+    return get_np_type(value) in ["complex64", "complex128"]
+
+
+def wrap_int(value: int, bits: int, signed: bool) -> int:
+    value &= (1 << bits) - 1
+    if signed and value >> (bits - 1):
+        value -= 1 << bits
+    return value
+
+
+def ordered(a, b):
+    # numpy orders complex numbers by their real part, then their imaginary part
+    if type(a) is complex or type(b) is complex:
+        a, b = complex(a), complex(b)
+        return (a.real, a.imag), (b.real, b.imag)
+    return a, b
+
+
+def real_power(base, exponent):
+    # numpy semantics for real powers: nan for a fractional power of a negative
+    # number and inf for 0 ** -n or an overflow, where Python gives a complex or raises
+    try:
+        result = base ** exponent
+    except (ZeroDivisionError, OverflowError):
+        result = None
+    if result is None or type(result) is complex:
+        with np.errstate(all="ignore"):
+            return float(np.float64(base) ** np.float64(exponent))
+    return result
+
+
+def round_float32(value: float) -> float:
+    try:
+        return struct.unpack("f", struct.pack("f", value))[0]
+    except OverflowError:
+        return math.copysign(math.inf, value)
+
+
+class Generic:
+    __slots__ = ("raw_value",)  # Number keeps its native scalar here and overrides `value`
+
+    def __init__(self, value):
+        self.value = value
+
+    @property
+    def value(self):
+        return self.raw_value
+
+    @value.setter
+    def value(self, value):
+        self.raw_value = value
+
+    def __add__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for +: '{type(self)}' and '{type(other)}')")
+
+    def __radd__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for +: '{type(other)}' and '{type(self)}')")
+
+    def __sub__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for -: '{type(self)}' and '{type(other)}')")
+
+    def __rsub__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for -: '{type(other)}' and '{type(self)}')")
+
+    def __mul__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for *: '{type(self)}' and '{type(other)}')")
+
+    def __rmul__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for *: '{type(other)}' and '{type(self)}')")
+
+    def __truediv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
+
+    def __rtruediv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for /: '{type(other)}' and '{type(self)}')")
+
+    def __floordiv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
+
+    def __rfloordiv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for //: '{type(other)}' and '{type(self)}')")
+
+    def __mod__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
+
+    def __rmod__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for %: '{type(other)}' and '{type(self)}')")
+
+    def __pow__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for **: '{type(self)}' and '{type(other)}')")
+
+    def __rpow__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for **: '{type(other)}' and '{type(self)}')")
+
+    def __neg__(self):
+        raise TypeError(f"Bad operand type for unary -: '{type(self)}'")
+
+    def __pos__(self):
+        raise TypeError(f"Bad operand type for unary +: '{type(self)}'")
+
+    def __abs__(self):
+        raise TypeError(f"Bad operand type for abs(): '{type(self)}'")
+
+    def __invert__(self):
+        raise TypeError(f"Bad operand type for unary ~: '{type(self)}'")
+
+    def __iadd__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for +=: '{type(self)}' and '{type(other)}')")
+
+    def __isub__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for -=: '{type(self)}' and '{type(other)}')")
+
+    def __imul__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for *=: '{type(self)}' and '{type(other)}')")
+
+    def __itruediv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for /=: '{type(self)}' and '{type(other)}')")
+
+    def __ifloordiv__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for //=: '{type(self)}' and '{type(other)}')")
+
+    def __imod__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for %=: '{type(self)}' and '{type(other)}')")
+
+    def __ipow__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for **=: '{type(self)}' and '{type(other)}')")
+
+    def __ilshift__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for <<=: '{type(self)}' and '{type(other)}')")
+
+    def __irshift__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for >>=: '{type(self)}' and '{type(other)}')")
+
+    def __iand__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for &=: '{type(self)}' and '{type(other)}')")
+
+    def __ixor__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for ^=: '{type(self)}' and '{type(other)}')")
+
+    def __ior__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for |=: '{type(self)}' and '{type(other)}')")
+
+    def __eq__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for ==: '{type(self)}' and '{type(other)}')")
+
+    def __ne__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for !=: '{type(self)}' and '{type(other)}')")
+
+    def __lt__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for <: '{type(self)}' and '{type(other)}')")
+
+    def __gt__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for >: '{type(self)}' and '{type(other)}')")
+
+    def __le__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for <=: '{type(self)}' and '{type(other)}')")
+
+    def __ge__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for >=: '{type(self)}' and '{type(other)}')")
+
+    def __and__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for &: '{type(self)}' and '{type(other)}')")
+
+    def __or__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for |: '{type(self)}' and '{type(other)}')")
+
+    def __xor__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for ^: '{type(self)}' and '{type(other)}')")
+
+    def __lshift__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
+
+    def __rshift__(self, other):
+        raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
+
+    def __int__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __complex__(self):
+        return complex(self.value)
+
+    def __str__(self):
+        return str(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    # repr() function =====
+    def __repr__(self):
+        return f"Generic({self.value})"
+
+    # hash() function =====
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bytes__(self):
+        return bytes(self.value) 
+
+
+class String(Generic):
+    """Text that `+` extends as a list of chunks instead of copying it.
+
+    A String holds plain `text` until it is concatenated. `s + piece` appends
+    to the chunk list of `s` when `s` is the newest String on that list, so
+    building text with `s = s + piece` in a loop is linear. The text is joined
+    the first time it is needed (`value`, str(), hashing, comparisons) and cached.
+    """
+    __slots__ = ("chunks", "count", "text")  # `count`: how many of `chunks` are this String's
+
+    def __init__(self, value):
+        self.value = str(value)
+
+    @classmethod
+    def _from_chunks(cls, chunks: list) -> "String":
+        string = cls.__new__(cls)
+        string.chunks, string.count, string.text = chunks, len(chunks), None
+        return string
+
+    @property
+    def value(self) -> str:
+        if self.text is None:
+            self.text = "".join(self.chunks[:self.count])
+            self.chunks, self.count = None, 0
+        return self.text
+
+    @value.setter
+    def value(self, value):
+        self.chunks, self.count, self.text = None, 0, value
+
+    def _pieces(self) -> list:
+        return [self.text] if self.text is not None else self.chunks[:self.count]
+
+    def __add__(self, other):
+        if isinstance(other, (String, str)):
+            chunks = self.chunks
+            if chunks is None:
+                chunks = [self.text]  # the first concatenation starts the list
+            elif len(chunks) != self.count:
+                chunks = chunks[:self.count]  # a longer String already appended to this list
+            if isinstance(other, String):
+                chunks.extend(other._pieces())
+            else:
+                chunks.append(other)
+            return type(self)._from_chunks(chunks)
+        else:
+            super().__add__(other)
+
+    def __radd__(self, other):
+        if isinstance(other, (String, str)):
+            return type(self)._from_chunks([other] + self._pieces())
+        else:
+            super().__radd__(other)
+
+    def __eq__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value == str(other))
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value != str(other))
+        return super().__ne__(other)
+
+    def __lt__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value < str(other))
+        return super().__lt__(other)
+
+    def __gt__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value > str(other))
+        return super().__gt__(other)
+
+    def __le__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value <= str(other))
+        return super().__le__(other)
+
+    def __ge__(self, other):
+        if isinstance(other, (String, str)):
+            return Boolean._from_raw(self.value >= str(other))
+        return super().__ge__(other)
+
+    __hash__ = Generic.__hash__
+
+    def __len__(self):
+        return len(self.value)
+
+    def __bytes__(self):
+        return to_bytes(self)
+
+def string(value):
+    return String(value)
+
+
+class Interned(type):
+    """Metaclass of the types that `enable_interning` serves from `cls.intern_cache`.
+
+    `enable_interning` installs `interned_call` as its `__call__`; while
+    interning is off, `cls(value)` is the plain `type.__call__`.
+    """
+
+
+def interned_call(cls, value, *args, **kwargs):
+    cache = cls.intern_cache
+    if cache is not None and type(value) in (int, bool):
+        instance = cache.get(value)
+        if instance is not None:
+            return instance
+    return type.__call__(cls, value, *args, **kwargs)
+
+
+def interned_setattr(self, name, value):
+    # installed on the interned types while interning is on: a cached instance is
+    # shared by every `cls(value)` call, so it must never change. The check is by
+    # identity because the cache is keyed by the value before wrapping (int8(200) is -56)
+    if id(self) in type(self).interned_ids:
+        raise AttributeError(f"{self!r} is interned and cannot be modified")
+    object.__setattr__(self, name, value)
+
+
+def keep_dtype(dtype: np.dtype, other) -> np.dtype | None:
+    # integer Vectors keep their dtype against integer operands and wrap,
+    # the same way Integer8 + Integer16 stays an Integer8
+    # (np.result_type overflows on a Python int outside the int64/uint64 range)
+    if dtype.kind in "iu" and (type(other) is int or np.result_type(other).kind in "biu"):
+        return dtype
+    return None
+
+
+def ufunc_dtype(value):
+    # Python scalars stay "weak" so they do not widen the array dtype
+    if type(value) in (int, float, complex):
+        return type(value)
+    elif isinstance(value, (str, bytes)):
+        # np.result_type would read "x" as a dtype name
+        return np.asarray(value).dtype
+    return np.result_type(value)
+
+
+def elementwise(ufunc: np.ufunc, a, b, dtype: np.dtype | None = None, out: np.ndarray | None = None):
+    if thread_pool is not None:
+        shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+        if len(shape) > 0 and shape[0] > 1 and math.prod(shape) >= thread_threshold:
+            return threaded_elementwise(ufunc, a, b, shape, dtype, out)
+    return serial_elementwise(ufunc, a, b, dtype, out)
+
+
+def serial_elementwise(ufunc: np.ufunc, a, b, dtype: np.dtype | None = None, out: np.ndarray | None = None):
+    if dtype is None and out is None:
+        return ufunc(a, b)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(a), np.shape(b)), dtype=dtype)
+    try:
+        ufunc(a, b, out=out, casting="unsafe")
+    except OverflowError:
+        # a Python int outside the dtype range: compute wide, then wrap
+        ufunc(wide_operand(a, out.dtype), wide_operand(b, out.dtype), out=out, casting="unsafe")
+    return out
+
+
+def wide_operand(value, dtype: np.dtype):
+    # an integer result takes a Python int beyond 64 bits wrapped to 64 bits, like Integer does
+    if type(value) is int and dtype.kind in "iu" and not -(1 << 63) <= value < 1 << 64:
+        value = wrap_int(value, 64, True)
+    return np.asarray(value)
+
+
+# ==============================
+# threaded execution
+# ==============================
+thread_pool = None  # see `enable_threading`
+thread_workers = 1
+thread_threshold = 1 << 18
+
+
+def enable_threading(workers: int | None = None, threshold: int = 1 << 18):
+    """Run elementwise operations on `threshold` or more elements on `workers` threads.
+
+    The output is split into contiguous blocks along the first axis and each
+    block is computed by one thread; numpy ufuncs release the GIL while they run.
+    `workers` defaults to the number of CPUs.
+    """
+    global thread_pool, thread_workers, thread_threshold
+    disable_threading()
+    thread_workers = workers or os.cpu_count() or 1
+    thread_threshold = threshold
+    thread_pool = ThreadPoolExecutor(thread_workers, thread_name_prefix="data_type")
+
+
+def disable_threading():
+    global thread_pool, thread_workers
+    if thread_pool is not None:
+        thread_pool.shutdown()
+    thread_pool, thread_workers = None, 1
+
+
+def threaded_elementwise(ufunc: np.ufunc, a, b, shape: tuple, dtype: np.dtype | None = None,
+                         out: np.ndarray | None = None) -> np.ndarray:
+    if out is None:
+        if dtype is None:
+            dtype = ufunc.resolve_dtypes((ufunc_dtype(a), ufunc_dtype(b), None))[-1]
+        out = np.empty(shape, dtype=dtype)
+
+    def block(value, start, stop):
+        if np.ndim(value) == 0:
+            return value
+        return np.broadcast_to(value, shape)[start:stop]
+
+    # an input overlapping `out` (`v += v[::-1]`) could be overwritten by another block first
+    a, b = (value.copy() if isinstance(value, np.ndarray) and value is not out and np.may_share_memory(value, out)
+            else value for value in (a, b))
+
+    bounds = np.linspace(0, shape[0], min(thread_workers, shape[0]) + 1).astype(int)
+    futures = [thread_pool.submit(serial_elementwise, ufunc, block(a, start, stop), block(b, start, stop),
+                                  None, out[start:stop])
+               for start, stop in zip(bounds[:-1], bounds[1:])]
+    for future in futures:
+        future.result()
+    return out
+
+class Number(Generic):
+    __slots__ = ()
+    priority = 0  # Default priority
+    intern_cache = None  # see `enable_interning`
+    interned_ids = frozenset()  # id() of every instance in `intern_cache`
+    native = None  # raw_value type that `_from_raw` stores without revalidating
+    dtype = None  # numpy element type of `cls.array`, set on every scalar type
+
+    def __init__(self, value):
+        if isinstance(value, (np.ndarray, np.generic)):
+            if value.shape != ():  # If value is not a scalar
+                raise ValueError("Value must be a scalar")
+            value = value.item()
+        # scalars are stored as native Python values; `value` exposes them as numpy
+        self.raw_value = self._wrap(value)
+
+    @classmethod
+    def _from_raw(cls, value):
+        # operators build their results here: a value of the `native` type is
+        # stored as is, anything else still goes through the public constructor
+        if type(value) is not cls.native or cls.intern_cache is not None:
+            if type(value) is complex and cls.native is not complex:
+                # a native operand never promotes the result (Integer(1) + 2.5 is an Integer),
+                # so like the numpy scalars this drops the imaginary part with a ComplexWarning
+                value = np.complex128(value)
+            return cls(value)
+        instance = cls.__new__(cls)
+        instance.raw_value = instance._wrap(value)
+        return instance
+
+    @classmethod
+    def array(cls, value) -> "Vector":
+        return Vector(value, dtype=cls._element_dtype())
+
+    @classmethod
+    def array_from_buffer(cls, buffer, shape=None, offset: int = 0) -> "Vector":
+        """Wrap a bytes-like object as a Vector of `cls.dtype` elements without copying, see `Vector.from_buffer`."""
+        return Vector.from_buffer(buffer, dtype=cls._element_dtype(), shape=shape, offset=offset)
+
+    @classmethod
+    def _element_dtype(cls):
+        if not isinstance(cls.dtype, type):  # None on Number, a property on Vector
+            raise TypeError(f"{cls.__name__} has no fixed element type")
+        return cls.dtype
+
+    def _wrap(self, value):
+        return value
+
+    def _inplace(self, value):
+        if type(value) is complex and self.native is not complex:
+            raise TypeError(f"Cannot store a complex result in {type(self).__name__}")  # numpy's same_kind rule
+        if self.intern_cache is not None:
+            # interned instances are shared, so in-place operators rebind instead of mutating
+            return type(self)(value)
+        self.raw_value = self._wrap(value)
+        return self
+
+    @property
+    def value(self):
+        return np.array(self.raw_value)
+
+    @value.setter
+    def value(self, value):
+        Number.__init__(self, value)
+
+    def cast(self, other):
+        entry = CAST_TABLE.get((type(self), type(other)))
+        if entry is None:
+            return self._cast_fallback(other)
+        return entry[0](self, other)
+
+    def _cast_fallback(self, other):
+        if isinstance(other, int) or is_np_int(other):
+            return self, Integer(other)
+        elif isinstance(other, float) or is_np_float(other):
+            return self, Real(other)
+        elif isinstance(other, complex) or is_np_complex(other):
+            return self, Complex(other)
+        elif isinstance(other, bool) or is_np_bool(other):
+            return self, Boolean(other)
+        elif isinstance(other, list):
+            return self, Vector(other)
+        elif isinstance(other, Vector):
+            if isinstance(self, Vector):
+                return self, other
+            raise DeferredOperand()  # scalar (op) Vector is the Vector's reflected operator
+        elif isinstance(other, Number):
+            if other.priority > self.priority:
+                if isinstance(self, Vector):
+                    return other, self  # `other.cast(self)` would defer back to the Vector
+                return other.cast(self)
+            return self, type(self)(other.raw_value)
+        elif isinstance(other, Undefined):
+            raise DeferredOperand()
+        else:
+            raise UnsupportedTypeError(type(other))
+
+    # ==============================
+    # arithmetic operations
+    # ==============================
+    # + operator =====
+    def __add__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        return type(self)._from_raw(self.raw_value + other.raw_value)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    # - operator =====
+    def __sub__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        return type(self)._from_raw(self.raw_value - other.raw_value)
+
+    def __rsub__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        return type(self)._from_raw(other.raw_value - self.raw_value)
+
+    # * operator =====
+    def __mul__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        return type(self)._from_raw(self.raw_value * other.raw_value)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    # / operator =====
+    def __truediv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if other.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex) :
+            return Complex._from_raw(self.raw_value / other.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(self.raw_value / other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
+
+    def __rtruediv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if self.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(other.raw_value / self.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(other.raw_value / self.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for /: '{type(self)}' and '{type(other)}')")
+
+    # // operator =====
+    def __floordiv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if self.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(self.raw_value // other.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(self.raw_value // other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
+
+    def __rfloordiv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if self.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(other.raw_value // self.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(other.raw_value // self.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for //: '{type(self)}' and '{type(other)}')")
+
+    # % operator =====
+    def __mod__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if other.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(self.raw_value % other.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(self.raw_value % other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
+
+    def __rmod__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if self.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(other.raw_value % self.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(other.raw_value % self.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for %: '{type(self)}' and '{type(other)}')")
+
+    # ** operator =====
+    def __pow__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Complex) or isinstance(other, Complex):
+            return Complex._from_raw(self.raw_value ** other.raw_value)
+        elif isinstance(self, (Boolean, Integer, Real)) and isinstance(other, (Boolean, Integer, Real)):
+            return Real._from_raw(real_power(self.raw_value, other.raw_value))
+        else:
+            raise TypeError(f"Unsupported operand type(s) for **: '{type(self)}' and '{type(other)}')")
+
+    def __rpow__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Real):
+            return type(self)._from_raw(real_power(other.raw_value, self.raw_value))
+        return type(self)._from_raw(other.raw_value ** self.raw_value)
+
+    # ==============================
+    # unary operator
+    # ==============================
+    # - operator =====
+    def __neg__(self):
+        return type(self)._from_raw(-self.raw_value)
+
+    # + operator =====
+    def __pos__(self):
+        return type(self)(self.raw_value)
+
+    # abs() function =====
+    def __abs__(self):
+        return type(self)._from_raw(abs(self.raw_value))
+
+    # ~ operator =====
+    def __invert__(self):
+        return type(self)._from_raw(~self.raw_value)
+
+    # ==============================
+    # inplace
+    # ==============================
+    # += operator =====
+    def __iadd__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(other, (Integer, Real, Complex)):
+            return self._inplace(self.raw_value + other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for +=: '{type(self)}' and '{type(other)}')")
+
+    # -= operator =====
+    def __isub__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(other, (Integer, Real, Complex)):
+            return self._inplace(self.raw_value - other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for -=: '{type(self)}' and '{type(other)}')")
+
+    # *= operator =====
+    def __imul__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(other, (Integer, Real, Complex)):
+            return self._inplace(self.raw_value * other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for *=: '{type(self)}' and '{type(other)}')")
+
+    # /= operator =====
+    def __itruediv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if other.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if isinstance(self, Integer):
+            self = Real(self.raw_value)
+        return self._inplace(self.raw_value / other.raw_value)
+
+    # //= operator =====
+    def __ifloordiv__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if other.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        return self._inplace(self.raw_value // other.raw_value)
+
+    # %= operator =====
+    def __imod__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if other.raw_value == 0:
+            raise ZeroDivisionError("Division by zero")
+        return self._inplace(self.raw_value % other.raw_value)
+
+    # **= operator =====
+    def __ipow__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Real):
+            return self._inplace(real_power(self.raw_value, other.raw_value))
+        return self._inplace(self.raw_value ** other.raw_value)
+
+    # <<= operator =====
+    def __ilshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
+            return self._inplace(self.raw_value << other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for <<=: '{type(self)}' and '{type(other)}')")
+
+    # >>= operator =====
+    def __irshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
+            return self._inplace(self.raw_value >> other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for >>=: '{type(self)}' and '{type(other)}')")
+
+    # &= operator =====
+    def __iand__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
+            return self._inplace(self.raw_value & other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for &=: '{type(self)}' and '{type(other)}')")
+
+    # ^= operator =====
+    def __ixor__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
+            return self._inplace(self.raw_value ^ other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for ^=: '{type(self)}' and '{type(other)}')")
+
+    # |= operator =====
+    def __ior__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, Boolean) and isinstance(other, (Integer, Real, Complex)):
+            self = Integer._from_raw(self.raw_value)
+        if isinstance(self, Integer) and isinstance(other, (Boolean, Integer)):
+            return self._inplace(self.raw_value | other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for |=: '{type(self)}' and '{type(other)}')")
+
+    # ==============================
+    # comparison operations
+    # ==============================
+    def __eq__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        return Boolean._from_raw(self.raw_value == other.raw_value)
+
+    def __ne__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        return Boolean._from_raw(self.raw_value != other.raw_value)
+
+    def __lt__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        a, b = ordered(self.raw_value, other.raw_value)
+        return Boolean._from_raw(a < b)
+
+    def __gt__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        a, b = ordered(self.raw_value, other.raw_value)
+        return Boolean._from_raw(a > b)
+
+    def __le__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        a, b = ordered(self.raw_value, other.raw_value)
+        return Boolean._from_raw(a <= b)
+
+    def __ge__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        a, b = ordered(self.raw_value, other.raw_value)
+        return Boolean._from_raw(a >= b)
+
+    # ==============================
+    # bitwise operations
+    # ==============================
+    # & operator =====
+    def __and__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(self.raw_value & other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for &: '{type(self)}' and '{type(other)}')")
+
+    def __rand__(self, other):
+        return self.__and__(other)
+
+    # | operator =====
+    def __or__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(self.raw_value | other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for |: '{type(self)}' and '{type(other)}')")
+
+    def __ror__(self, other):
+        return self.__or__(other)
+
+    # ^ operator =====
+    def __xor__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(self.raw_value ^ other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for ^: '{type(self)}' and '{type(other)}')")
+
+    def __rxor__(self, other):
+        return self.__xor__(other)
+
+    # << operator =====
+    def __lshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(self.raw_value << other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
+
+    def __rlshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(other << self.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for <<: '{type(self)}' and '{type(other)}')")
+
+    # >> operator =====
+    def __rshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(self.raw_value >> other.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
+
+    def __rrshift__(self, other):
+        try:
+            self, other = self.cast(other)
+        except DeferredOperand:
+            return NotImplemented
+        if isinstance(self, (Boolean, Integer)) or isinstance(other, (Boolean, Integer)):
+            return Integer._from_raw(other.raw_value >> self.raw_value)
+        else:
+            raise TypeError(f"Unsupported operand type(s) for >>: '{type(self)}' and '{type(other)}')")
+
+    # ==============================
+    # other
+    # ==============================
+    # repr() function =====
+    def __repr__(self):
+        return f"Number({self.raw_value})"
+
+
+    def __int__(self):
+        return int(self.raw_value)
+
+    def __float__(self):
+        return float(self.raw_value)
+
+    def __complex__(self):
+        return complex(self.raw_value)
+
+    def __str__(self):
+        return str(self.raw_value)
+
+    def __bool__(self):
+        return bool(self.raw_value)
+
+    def to_bytes(self) -> bytes:
+        """Compact binary encoding, see `encode`; `from_bytes` reads it back."""
+        return to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data) -> "Number":
+        value = from_bytes(data)
+        if not isinstance(value, cls):
+            raise CastError(type(value).__name__, cls.__name__)
+        return value
+
+    def __bytes__(self):
+        return to_bytes(self)
+
+    # ==============================
+    # numpy protocols
+    # ==============================
+    def __array__(self, dtype=None, copy=None):
+        scalar = ARRAY_SCALARS.get(type(self))
+        value = scalar(self.raw_value) if scalar is not None else self.raw_value
+        if copy:
+            return np.array(value, dtype=dtype, copy=True)
+        return np.asarray(value, dtype=dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # ufuncs run on the raw values and the result is wrapped again, see `array_wrap`
+        target = inputs[0] if method == "at" and isinstance(inputs[0], Vector) else None
+        if target is not None:
+            target._own()  # `ufunc.at` writes into its first operand
+        raw, classes = [], []
+        for value in inputs:
+            if isinstance(value, Number):
+                raw.append(array_unwrap(value))
+                classes.append(type(value))
+            elif isinstance(value, Generic):
+                return NotImplemented
+            else:
+                raw.append(value)
+        out = kwargs.get("out")
+        if out is not None:
+            for value in out:
+                if isinstance(value, Vector):
+                    value._own()
+            kwargs["out"] = tuple(value.raw_value if isinstance(value, Vector) else value for value in out)
+        result = getattr(ufunc, method)(*raw, **kwargs)
+        if target is not None:
+            target.mutated()
+        if out is not None:
+            for value in out:
+                if isinstance(value, Vector):
+                    value.mutated()
+            return out[0] if len(out) == 1 else out
+        if type(result) is tuple:
+            return tuple(array_wrap(value, classes) for value in result)
+        return array_wrap(result, classes)
+
+    def __array_function__(self, func, types, args, kwargs):
+        if not all(issubclass(cls, (Number, np.ndarray)) for cls in types):
+            return NotImplemented
+        result = array_wrap_all(func(*array_unwrap(args), **array_unwrap(kwargs)))
+        # np.transpose, np.ravel, np.split, ... return views: make them copy-on-write views
+        sources = list(vectors_in((args, kwargs)))
+        for view in vectors_in(result):
+            for source in sources:
+                if np.may_share_memory(view.raw_value, source.raw_value):
+                    source._share(view)
+                    break
+        return result
+
+
+class Boolean(Number, metaclass=Interned):
+    __slots__ = ()
+    priority = 0
+    dtype = np.bool_
+
+    def __init__(self, value):
+        if isinstance(value, str):
+            try:
+                value = int(float(value))
+                super().__init__(value)
+                return
+            except ValueError:
+                pass
+            value = int(not value.lower() in ["false", "0"])
+        elif isinstance(value, Number):
+            if isinstance(value, Boolean):
+                value = value.raw_value
+            elif isinstance(value, (Integer, Real, Complex)):
+                value = int(bool(value.raw_value))
+            elif isinstance(value, Vector):
+                value = int(np.all(value.raw_value))
+            else:
+                raise CastError(type(value), type(self))
+        else:
+            try:
+                value = int(bool(value))
+            except ValueError:
+                raise ValueError("Value must be convertible to a boolean")
+        super().__init__(value)
+
+    @classmethod
+    def _from_raw(cls, value):
+        if type(value) is not bool or cls.intern_cache is not None:
+            return cls(value)
+        instance = cls.__new__(cls)
+        instance.raw_value = int(value)
+        return instance
+
+    def __repr__(self):
+        return f"Boolean({self.raw_value})"
+
+def boolean(value):
+    return Boolean(value)
+
+
+class Integer(Number, metaclass=Interned):
+    __slots__ = ()
+    priority = 1
+    base = 10
+    native = int
+    bits = 64  # wraps like the int64 it was stored as; fixed-width subclasses narrow it
+    signed = True
+    dtype = np.int64
+
+    def __init__(self, value):
+        if isinstance(value, str):
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError("Value must be an integer")
+        elif isinstance(value, Number):
+            if isinstance(value, Integer):
+                value = value.raw_value
+            elif isinstance(value, Complex) or isinstance(value, complex) or is_np_complex(value):
+                raise CastError(type(value).__name__, type(self).__name__)
+            elif isinstance(value, Vector):
+                raise CastError(type(value).__name__, type(self).__name__)
+            else:
+                value = int(value.raw_value)
+        else:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError("Value must be an integer")
+        super().__init__(value)
+
+    def _wrap(self, value):
+        return wrap_int(value, self.bits, self.signed)
+
+    def to_int8(self):
+        return Integer(wrap_int(self.raw_value, 8, True))
+
+    def to_int16(self):
+        return Integer(wrap_int(self.raw_value, 16, True))
+
+    def to_int32(self):
+        return Integer(wrap_int(self.raw_value, 32, True))
+
+    def to_int64(self):
+        return Integer(wrap_int(self.raw_value, 64, True))
+
+    def to_uint8(self):
+        return Integer(wrap_int(self.raw_value, 8, False))
+
+    def to_uint16(self):
+        return Integer(wrap_int(self.raw_value, 16, False))
+
+    def to_uint32(self):
+        return Integer(wrap_int(self.raw_value, 32, False))
+
+    def to_uint64(self):
+        return Integer(wrap_int(self.raw_value, 64, False))
+
+    def __iter__(self):
+        return iter(range(self.raw_value))
+
+    def __repr__(self):
+        return f"Integer({self.raw_value})"
+
+class Integer8(Integer):
+    __slots__ = ()
+    bits = 8
+    dtype = np.int8
+
+class Integer16(Integer):
+    __slots__ = ()
+    bits = 16
+    dtype = np.int16
+
+class Integer32(Integer):
+    __slots__ = ()
+    bits = 32
+    dtype = np.int32
+
+class Integer64(Integer):
+    __slots__ = ()
+    bits = 64
+    dtype = np.int64
+
+class UnsignedInteger8(Integer):
+    __slots__ = ()
+    bits = 8
+    signed = False
+    dtype = np.uint8
+
+class UnsignedInteger16(Integer):
+    __slots__ = ()
+    bits = 16
+    signed = False
+    dtype = np.uint16
+
+class UnsignedInteger32(Integer):
+    __slots__ = ()
+    bits = 32
+    signed = False
+    dtype = np.uint32
+
+class UnsignedInteger64(Integer):
+    __slots__ = ()
+    bits = 64
+    signed = False
+    dtype = np.uint64
+
+def integer(value):
+    return Integer(value)
+
+def int8(value):
+    return Integer8(value)
+
+def int16(value):
+    return Integer16(value)
+
+def int32(value):
+    return Integer32(value)
+
+def int64(value):
+    return Integer64(value)
+
+def uint8(value):
+    return UnsignedInteger8(value)
+
+def uint16(value):
+    return UnsignedInteger16(value)
+
+def uint32(value):
+    return UnsignedInteger32(value)
+
+def uint64(value):
+    return UnsignedInteger64(value)
+
+def int8_array(value):
+    return Integer8.array(value)
+
+def int16_array(value):
+    return Integer16.array(value)
+
+def int32_array(value):
+    return Integer32.array(value)
+
+def int64_array(value):
+    return Integer64.array(value)
+
+def uint8_array(value):
+    return UnsignedInteger8.array(value)
+
+def uint16_array(value):
+    return UnsignedInteger16.array(value)
+
+def uint32_array(value):
+    return UnsignedInteger32.array(value)
+
+def uint64_array(value):
+    return UnsignedInteger64.array(value)
+
+
+class Real(Number):
+    __slots__ = ()
+    priority = 2
+    native = float
+    dtype = np.float64
+
+    def __init__(self, value):
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError("Value must be a real number")
+        elif isinstance(value, Number):
+            if isinstance(value, Real):
+                value = value.raw_value
+            elif isinstance(value, Complex) or isinstance(value, complex) or is_np_complex(value):
+                raise CastError(type(value).__name__, type(self).__name__)
+            elif isinstance(value, Vector):
+                raise CastError(type(value).__name__, type(self).__name__)
+            else:
+                value = float(value.raw_value)
+        else:
+            value = float(value)
+        super().__init__(value)
+
+    def __repr__(self):
+        return f"Real({self.raw_value})"
+
+
+class Real32(Real):
+    __slots__ = ()
+    dtype = np.float32
+
+    def _wrap(self, value):
+        return round_float32(value)
+
+
+class Real64(Real):
+    __slots__ = ()
+
+
+def real(value):
+    return Real(value)
+
+def real32(value):
+    return Real32(value)
+
+def real64(value):
+    return Real64(value)
+
+
+class Complex(Number):
+    __slots__ = ()
+    priority = 3
+    native = complex
+    dtype = np.complex128
+
+    def __init__(self, value):
+        if isinstance(value, str):
+            try:
+                value = complex(value)
+            except ValueError:
+                raise ValueError("Value must be a complex number")
+        elif isinstance(value, Number):
+            if isinstance(value, Complex):
+                value = value.raw_value
+            elif isinstance(value, Vector):
+                raise CastError(type(value).__name__, type(self).__name__)
+            else:
+                value = complex(value.raw_value)
+        else:
+            try:
+                value = complex(value)
+            except ValueError:
+                raise ValueError("Value must be a complex number")
+        super().__init__(value)
+
+    @property
+    def real(self):
+        return Real(self.raw_value.real)
+
+    @property
+    def imag(self):
+        return Real(self.raw_value.imag)
+
+    def __repr__(self):
+        return f"Complex({self.raw_value})"
+
+
+class Complex64(Complex):
+    __slots__ = ()
+    dtype = np.complex64
+
+    def _wrap(self, value):
+        return complex(round_float32(value.real), round_float32(value.imag))
+
+
+class Complex128(Complex):
+    __slots__ = ()
+
+
+def imag(value):
+    return Complex(value)
+
+def imag64(value):
+    return Complex(np.complex64(value))
+
+def imag128(value):
+    return Complex(np.complex128(value))
+
+
+class SharedBuffer:
+    """The Vectors viewing one buffer, see `Vector._share`.
+
+    Members are held by weak references keyed by id (Vectors are unhashable),
+    and a member drops out as soon as it is garbage collected.
+    """
+
+    def __init__(self, owner: "Vector"):
+        self.owner = weakref.ref(owner)
+        self.members = {}
+        self.peak = 0
+        self.add(owner)
+
+    def add(self, vector: "Vector"):
+        key, group = id(vector), weakref.ref(self)
+
+        def remove(ref):
+            shared = group()
+            if shared is not None and shared.members.get(key) is ref:
+                del shared.members[key]
+                if len(shared.members) < shared.peak // 8:
+                    # a dict keeps its table after deletions; copy it once most views are gone
+                    shared.members = dict(shared.members)
+                    shared.peak = len(shared.members)
+
+        self.members[key] = weakref.ref(vector, remove)
+        self.peak = max(self.peak, len(self.members))
+
+    def discard(self, vector: "Vector"):
+        self.members.pop(id(vector), None)
+
+    def clear(self):
+        self.members.clear()
+
+    def __iter__(self):
+        return (vector for vector in (ref() for ref in list(self.members.values())) if vector is not None)
+
+    def __len__(self):
+        return len(self.members)
+
+
+class Vector(Number):
+    # `version`/`memo`: see `mutated`; `shared`: see `_share`; all are set on first use
+    __slots__ = ("version", "memo", "shared", "__weakref__")
+    scan_chunk = 1 << 16  # elements per block in `any`/`all`
+
+    def __init__(self, value: list | np.ndarray, dtype=None):
+        if isinstance(value, Vector) and (dtype is None or np.dtype(dtype) == value.dtype):
+            # no copy: both Vectors share the buffer until one of them is written
+            self.raw_value = value.raw_value.view()
+            value._share(self)
+        else:
+            self.raw_value = np.array(value.raw_value if isinstance(value, Vector) else value)
+            if dtype is not None:
+                # astype wraps out-of-range integers like the fixed-width scalars do
+                self.raw_value = self.raw_value.astype(dtype, copy=False)
+        if self.raw_value.shape == ():
+            raise ValueError("Vector must have at least one dimension")
+
+    @classmethod
+    def _from_raw(cls, value):
+        # operator results are fresh arrays and np.memmap buffers must stay mapped,
+        # so any ndarray is stored without the copy `__init__` makes
+        if not isinstance(value, np.ndarray):
+            return cls(value)
+        instance = cls.__new__(cls)
+        instance.raw_value = value
+        return instance
+
+    @property
+    def value(self):
+        # the caller may write into the array, so a shared buffer is owned first (see `_own`)
+        self._own()
+        return self.raw_value
+
+    @value.setter
+    def value(self, value):
+        if getattr(self, "shared", None) is not None:
+            self._detach()  # the new buffer is private; leave the old one to the other views
+        self.raw_value = value
+        self.mutated()
+
+    def mutated(self):
+        """Bump the mutation version, which drops the cached `rank`, `norm` and `eig()`.
+
+        `__setitem__`, the in-place operators and `apply(out=...)` call this;
+        call it after writing into the array returned by `.value` directly.
+        """
+        self.version = getattr(self, "version", 0) + 1
+
+    def _share(self, other: "Vector") -> "Vector":
+        """Register `other`, whose array is a view of this buffer, as a copy-on-write view.
+
+        Vectors sharing a buffer are members of one `SharedBuffer` in `shared`,
+        which also remembers the Vector that owns the buffer. Before a write,
+        `_own` separates the writer from the rest: a view copies its own
+        elements; the owner copies its live views out and keeps its buffer, so
+        np.memmap and `from_buffer` Vectors stay attached to their memory.
+        """
+        group = getattr(self, "shared", None)
+        if group is None:
+            group = self.shared = SharedBuffer(self)
+        group.add(other)
+        other.shared = group
+        return other
+
+    def _own(self):
+        # called before every write into the buffer
+        group = getattr(self, "shared", None)
+        if group is None:
+            return
+        peers = [peer for peer in group if peer is not self]
+        if peers and group.owner() is not self:
+            self._detach()
+            return
+        for peer in peers:
+            peer.shared = None
+            peer.raw_value = np.array(peer.raw_value)
+        group.clear()
+        self.shared = None
+
+    def _detach(self):
+        self.shared.discard(self)
+        self.shared = None
+        self.raw_value = np.array(self.raw_value)
+
+    def __reduce__(self):
+        return type(self)._from_raw, (np.array(self.raw_value),)
+
+    def __array__(self, dtype=None, copy=None):
+        if not copy:
+            self._own()  # np.asarray(vector) may be written through, like `.value`
+        return super().__array__(dtype, copy)
+
+    def _memoized(self, name, compute):
+        version = getattr(self, "version", 0)
+        memo = getattr(self, "memo", None)
+        if memo is None or memo[0] != version:
+            memo = self.memo = (version, {})
+        results = memo[1]
+        if name not in results:
+            results[name] = compute()
+        return results[name]
+
+    @property
+    def dtype(self):
+        return self.raw_value.dtype
+
+    @classmethod
+    def from_buffer(cls, buffer, dtype=np.uint8, shape=None, offset: int = 0) -> "Vector":
+        """Wrap a bytes-like object (bytes, bytearray, memoryview, mmap, ...) without copying.
+
+        The Vector shares memory with `buffer`: writes through a writable buffer
+        show up in the Vector, and a read-only buffer gives a read-only Vector.
+        """
+        array = np.frombuffer(buffer, dtype=dtype, offset=offset)
+        if shape is not None:
+            array = array.reshape(shape)
+        return cls._from_raw(array)
+
+    @classmethod
+    def open_mmap(cls, path, dtype=np.uint8, shape=None, mode: str = "r+", offset: int = 0) -> "Vector":
+        """Return a Vector backed by `np.memmap` over the file at `path`.
+
+        Pages are read from disk when they are touched, so the file may be larger
+        than RAM. `mode` is the np.memmap mode: "r", "r+", "w+" (create, needs
+        `shape`) or "c" (copy-on-write). Use `apply(..., out=)` to write results
+        into another mapped Vector, and `flush()` to push writes to disk.
+        """
+        return cls._from_raw(np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape))
+
+    def flush(self):
+        if isinstance(self.raw_value, np.memmap):
+            self.raw_value.flush()
+
+    def apply(self, ufunc: np.ufunc, other, out: "Vector | None" = None) -> "Vector":
+        """Return `ufunc(self, other)` elementwise, written into `out` when it is given.
+
+        `out` is filled in place with numpy's unsafe casting, so the result of a
+        large operation can go straight into a mapped file instead of RAM.
+        """
+        if out is None:
+            return self._elementwise(ufunc, other)
+        out._own()
+        elementwise(ufunc, self.raw_value, self._operand(other), out=out.raw_value)
+        out.mutated()
+        return out
+
+    def lazy(self) -> "LazyVector":
+        """Return a LazyVector sharing this buffer; its operators build an expression tree."""
+        return self._share(LazyVector.leaf(self.raw_value.view()))
+
+    def _operand(self, other):
+        if isinstance(other, Number):
+            return other.raw_value
+        elif isinstance(other, list):
+            return np.array(other)
+        elif isinstance(other, (int, float, complex, np.ndarray, np.generic)):
+            return other
+        else:
+            raise UnsupportedTypeError(type(other))
+
+    def _elementwise(self, ufunc, other, reflected=False, typed=True):
+        # `typed`: an integer Vector keeps its dtype (see `keep_dtype`); false for / and comparisons
+        if isinstance(other, LazyVector):
+            # stay lazy when a plain Vector meets an expression; like every leaf,
+            # `self` is taken as it is now
+            operands = (other, self.lazy()) if reflected else (self.lazy(), other)
+            return other._node(ufunc, operands, typed=(1 if reflected else 0) if typed else None)
+        other = self._operand(other)
+        a, b = (other, self.raw_value) if reflected else (self.raw_value, other)
+        dtype = keep_dtype(self.raw_value.dtype, other) if typed else None
+        return type(self)._from_raw(elementwise(ufunc, a, b, dtype))
+
+    # + operator =====
+    def __add__(self, other):
+        return self._elementwise(np.add, other)
+
+    def __radd__(self, other):
+        return self._elementwise(np.add, other, reflected=True)
+
+    # - operator =====
+    def __sub__(self, other):
+        return self._elementwise(np.subtract, other)
+
+    def __rsub__(self, other):
+        return self._elementwise(np.subtract, other, reflected=True)
+
+    # * operator =====
+    def __mul__(self, other):
+        return self._elementwise(np.multiply, other)
+
+    def __rmul__(self, other):
+        return self._elementwise(np.multiply, other, reflected=True)
+
+    # // operator =====
+    def __floordiv__(self, other):
+        return self._elementwise(np.floor_divide, other)
+
+    def __rfloordiv__(self, other):
+        return self._elementwise(np.floor_divide, other, reflected=True)
+
+    # % operator =====
+    def __mod__(self, other):
+        return self._elementwise(np.remainder, other)
+
+    def __rmod__(self, other):
+        return self._elementwise(np.remainder, other, reflected=True)
+
+    # ** operator =====
+    def __pow__(self, other):
+        return self._elementwise(np.power, other)
+
+    def __rpow__(self, other):
+        return self._elementwise(np.power, other, reflected=True)
+
+    # & operator =====
+    def __and__(self, other):
+        return self._elementwise(np.bitwise_and, other)
+
+    def __rand__(self, other):
+        return self._elementwise(np.bitwise_and, other, reflected=True)
+
+    # | operator =====
+    def __or__(self, other):
+        return self._elementwise(np.bitwise_or, other)
+
+    def __ror__(self, other):
+        return self._elementwise(np.bitwise_or, other, reflected=True)
+
+    # ^ operator =====
+    def __xor__(self, other):
+        return self._elementwise(np.bitwise_xor, other)
+
+    def __rxor__(self, other):
+        return self._elementwise(np.bitwise_xor, other, reflected=True)
+
+    # << operator =====
+    def __lshift__(self, other):
+        return self._elementwise(np.left_shift, other)
+
+    def __rlshift__(self, other):
+        return self._elementwise(np.left_shift, other, reflected=True)
+
+    # >> operator =====
+    def __rshift__(self, other):
+        return self._elementwise(np.right_shift, other)
+
+    def __rrshift__(self, other):
+        return self._elementwise(np.right_shift, other, reflected=True)
+
+    def _inplace_elementwise(self, ufunc, other):
+        # writes into the existing buffer; integer Vectors wrap against integer operands
+        # like `_elementwise`, everything else follows numpy's same_kind casting
+        other = self._operand(other)
+        dtype = self.raw_value.dtype
+        if ufunc is np.true_divide or keep_dtype(dtype, other) is None:
+            result = ufunc.resolve_dtypes((dtype, ufunc_dtype(other), None))[-1]
+            if not np.can_cast(result, dtype, "same_kind"):
+                raise TypeError(f"Cannot cast {ufunc.__name__} output from {result} to {dtype}")
+        self._own()
+        elementwise(ufunc, self.raw_value, other, out=self.raw_value)
+        self.mutated()
+        return self
+
+    # += operator =====
+    def __iadd__(self, other):
+        return self._inplace_elementwise(np.add, other)
+
+    # -= operator =====
+    def __isub__(self, other):
+        return self._inplace_elementwise(np.subtract, other)
+
+    # *= operator =====
+    def __imul__(self, other):
+        return self._inplace_elementwise(np.multiply, other)
+
+    # /= operator =====
+    def __itruediv__(self, other):
+        return self._inplace_elementwise(np.true_divide, other)
+
+    # //= operator =====
+    def __ifloordiv__(self, other):
+        return self._inplace_elementwise(np.floor_divide, other)
+
+    # %= operator =====
+    def __imod__(self, other):
+        return self._inplace_elementwise(np.remainder, other)
+
+    # **= operator =====
+    def __ipow__(self, other):
+        return self._inplace_elementwise(np.power, other)
+
+    # <<= operator =====
+    def __ilshift__(self, other):
+        return self._inplace_elementwise(np.left_shift, other)
+
+    # >>= operator =====
+    def __irshift__(self, other):
+        return self._inplace_elementwise(np.right_shift, other)
+
+    # &= operator =====
+    def __iand__(self, other):
+        return self._inplace_elementwise(np.bitwise_and, other)
+
+    # |= operator =====
+    def __ior__(self, other):
+        return self._inplace_elementwise(np.bitwise_or, other)
+
+    # ^= operator =====
+    def __ixor__(self, other):
+        return self._inplace_elementwise(np.bitwise_xor, other)
+
+    # / operator =====
+    def __truediv__(self, other):
+        return self._elementwise(np.true_divide, other, typed=False)
+
+    def __rtruediv__(self, other):
+        return self._elementwise(np.true_divide, other, reflected=True, typed=False)
+
+    # == operator =====
+    def __eq__(self, other):
+        return self._elementwise(np.equal, other, typed=False)
+
+    # != operator =====
+    def __ne__(self, other):
+        return self._elementwise(np.not_equal, other, typed=False)
+
+    # >= operator =====
+    def __ge__(self, other):
+        return self._elementwise(np.greater_equal, other, typed=False)
+
+    # > operator =====
+    def __gt__(self, other):
+        return self._elementwise(np.greater, other, typed=False)
+
+    # <= operator =====
+    def __le__(self, other):
+        return self._elementwise(np.less_equal, other, typed=False)
+
+    # < operator =====
+    def __lt__(self, other):
+        return self._elementwise(np.less, other, typed=False)
+
+    def __repr__(self):
+        return f"Vector({self.raw_value})"
+
+    def __getitem__(self, item):
+        # slices are copy-on-write Vector views, single elements stay numpy scalars
+        value = self.raw_value[item]
+        if not isinstance(value, np.ndarray) or value.shape == ():
+            return value
+        if np.may_share_memory(value, self.raw_value):
+            return self._share(type(self)._from_raw(value))
+        return type(self)._from_raw(value)
+
+    def __setitem__(self, key, value):
+        self._own()
+        self.raw_value[key] = value.raw_value if isinstance(value, Number) else value
+        self.mutated()
+
+    # + operator =====
+    def __pos__(self):
+        return self._share(type(self)._from_raw(self.raw_value.view()))
+
+    def __len__(self):
+        return len(self.raw_value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __next__(self):
+        return next(self.value)
+
+    def __contains__(self, item):
+        return item in self.raw_value
+
+    def __index__(self):
+        return self.raw_value.__index__()
+
+    def __reversed__(self):
+        return reversed(self.value)
+
+    # ==============================
+    # reductions
+    # ==============================
+    # Every reduction takes `axis` like numpy and returns a typed scalar
+    # (see `reduction_result`) or, when axes remain, a Vector.
+    def sum(self, axis=None, dtype=None):
+        """Sum over `axis`, accumulating in `dtype`.
+
+        Integer Vectors accumulate in their own dtype by default and wrap like
+        Integer8 + Integer8 does; pass e.g. `dtype=np.int64` to widen instead.
+        Floats are summed pairwise (numpy's `add.reduce`).
+        """
+        return reduction_result(np.add.reduce(self.raw_value, axis=axis, dtype=self._accumulator(dtype)))
+
+    def prod(self, axis=None, dtype=None):
+        return reduction_result(np.multiply.reduce(self.raw_value, axis=axis, dtype=self._accumulator(dtype)))
+
+    def mean(self, axis=None, dtype=None):
+        return reduction_result(np.mean(self.raw_value, axis=axis, dtype=dtype))
+
+    def min(self, axis=None):
+        return reduction_result(np.minimum.reduce(self.raw_value, axis=axis))
+
+    def max(self, axis=None):
+        return reduction_result(np.maximum.reduce(self.raw_value, axis=axis))
+
+    def argmax(self, axis=None):
+        return reduction_result(np.argmax(self.raw_value, axis=axis))
+
+    def count(self, axis=None):
+        """Number of non-zero elements."""
+        return reduction_result(np.count_nonzero(self.raw_value, axis=axis))
+
+    def any(self, axis=None):
+        if axis is None:
+            return Boolean._from_raw(self._scan(np.any, True))
+        return reduction_result(np.any(self.raw_value, axis=axis))
+
+    def all(self, axis=None):
+        if axis is None:
+            return Boolean._from_raw(not self._scan(lambda block: not np.all(block), True))
+        return reduction_result(np.all(self.raw_value, axis=axis))
+
+    def _accumulator(self, dtype):
+        if dtype is None and self.raw_value.dtype.kind in "iu":
+            return self.raw_value.dtype.newbyteorder("=")  # ufuncs only take native byte order
+        return dtype
+
+    def _scan(self, test, stop) -> bool:
+        # runs `test` over blocks of about `scan_chunk` elements (whole rows, so no copies)
+        # and returns as soon as one block gives `stop`
+        array = self.raw_value
+        if array.size == 0:
+            return not stop
+        rows = max(1, self.scan_chunk * len(array) // array.size)
+        for start in range(0, len(array), rows):
+            if bool(test(array[start:start + rows])) == stop:
+                return stop
+        return not stop
+
+    def dot(self, other):
+        self, other = self.cast(other)
+        return Vector._from_raw(np.dot(self.raw_value, other.raw_value))
+
+    # @ operator =====
+    def __matmul__(self, other):
+        return array_result(np.matmul(self.raw_value, self._operand(other)))
+
+    def __rmatmul__(self, other):
+        return array_result(np.matmul(self._operand(other), self.raw_value))
+
+    @classmethod
+    def contract(cls, spec: str, *operands):
+        """Evaluate the einsum `spec` over `operands` in the cheapest pairwise order.
+
+            Vector.contract("ij,jk,kl->il", a, b, c)  # a @ b @ c, cheapest association first
+
+        The order is planned once per `(spec, operand shapes)` and cached, see
+        `contraction_plan`. A result without dimensions is returned as a scalar.
+        """
+        arrays = [operand.raw_value if isinstance(operand, Number) else np.asarray(operand) for operand in operands]
+        path = contraction_plan(spec, tuple(array.shape for array in arrays))
+        return array_result(np.einsum(spec, *arrays, optimize=path), cls)
+
+    def eig(self):
+        return self._memoized("eig", self._eig)
+
+    def _eig(self):
+        result = np.linalg.eig(self.raw_value)
+        for array in result:
+            array.flags.writeable = False  # the cached arrays are shared by every caller
+        return result
+
+    @property
+    def shape(self):
+        return self.raw_value.shape
+
+    @property
+    def rank(self):
+        return self._memoized("rank", lambda: np.linalg.matrix_rank(self.raw_value))
+
+    @property
+    def norm(self):
+        # a fresh Real each time: the cached value must not be changed by `norm += ...`
+        return Real(self._memoized("norm", lambda: np.linalg.norm(self.raw_value)))
+
+    @property
+    def T(self):
+        return self._share(type(self)._from_raw(self.raw_value.T))
+
+
+
+class LazyVector(Vector):
+    """Vector whose operators record an expression tree instead of computing it.
+
+    The tree is evaluated the first time the value is needed (`eval()`, repr,
+    indexing, ...). Intermediate results are written into each other with
+    ufunc `out=` buffers, so `a * b + c / d` allocates two arrays, not three.
+    """
+    __slots__ = ("ufunc", "operands", "typed", "result")
+
+    def __init__(self, value: list | np.ndarray, dtype=None):
+        self.ufunc = None
+        self.operands = ()
+        self.typed = None
+        super().__init__(value, dtype)
+
+    @classmethod
+    def leaf(cls, value: np.ndarray) -> "LazyVector":
+        # shares `value` rather than copying it like `__init__` does
+        node = cls.__new__(cls)
+        node.ufunc, node.operands, node.typed, node.result = None, (), None, value
+        return node
+
+    @classmethod
+    def _from_raw(cls, value):
+        return cls.leaf(value)
+
+    @property
+    def raw_value(self):
+        if self.result is None:
+            self.result = self._evaluate()
+            self.ufunc, self.operands = None, ()
+        return self.result
+
+    @raw_value.setter
+    def raw_value(self, value):
+        self.result = value
+
+    def eval(self) -> "LazyVector":
+        self.raw_value
+        return self
+
+    def _node(self, ufunc, operands, typed=None) -> "LazyVector":
+        # `typed` is the index of the Vector operand whose integer dtype is kept
+        node = LazyVector.__new__(LazyVector)
+        node.ufunc, node.operands, node.typed, node.result = ufunc, operands, typed, None
+        return node
+
+    def _evaluate(self) -> np.ndarray:
+        # post-order walk without recursion; a subexpression used twice is a single node
+        order, visited, stack = [], set(), [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+            elif id(node) not in visited:
+                visited.add(id(node))
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node.operands)
+                             if isinstance(operand, LazyVector) and operand.result is None)
+        uses = {}
+        for node in order:
+            for operand in node.operands:
+                if isinstance(operand, LazyVector) and operand.result is None:
+                    uses[id(operand)] = uses.get(id(operand), 0) + 1
+
+        # every node is computed once into a temporary; a temporary may be
+        # overwritten as an `out` buffer once its last user has read it
+        values = {}
+        for node in order:
+            arrays, free = [], []
+            for operand in node.operands:
+                if isinstance(operand, LazyVector) and operand.result is None:
+                    key = id(operand)
+                    arrays.append(values[key])
+                    uses[key] -= 1
+                    if uses[key] == 0:
+                        free.append(values.pop(key))
+                else:
+                    arrays.append(operand.result if isinstance(operand, LazyVector) else operand)
+            a, b = arrays
+            dtype = None
+            if node.typed is not None:
+                dtype = keep_dtype(arrays[node.typed].dtype, arrays[1 - node.typed])
+            if dtype is None:
+                dtype = node.ufunc.resolve_dtypes((ufunc_dtype(a), ufunc_dtype(b), None))[-1]
+            shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+            out = next((value for value in free if value.shape == shape and value.dtype == dtype), None)
+            values[id(node)] = elementwise(node.ufunc, a, b, dtype, out)
+        return values[id(self)]
+
+    def _lazy_operand(self, other):
+        if isinstance(other, LazyVector):
+            return other
+        elif isinstance(other, Vector):
+            return other.lazy()  # a copy-on-write leaf, so later writes to `other` are not seen
+        return self._operand(other)
+
+    def _elementwise(self, ufunc, other, reflected=False, typed=True):
+        other = self._lazy_operand(other)
+        if reflected:
+            return self._node(ufunc, (other, self), typed=1 if typed else None)
+        return self._node(ufunc, (self, other), typed=0 if typed else None)
+
+    def _inplace_elementwise(self, ufunc, other):
+        # a leaf shares its buffer with the Vector it came from, so `+=` builds a node instead
+        return self._elementwise(ufunc, other, typed=ufunc is not np.true_divide)
+
+
+class StringVector(Vector):
+    """Vector of strings held in one contiguous numpy string array.
+
+    The default dtype is numpy's fixed-width unicode (`<U<n>`); pass
+    `dtype=np.dtypes.StringDType()` for variable-length storage. `+`
+    concatenates element by element and comparisons give Boolean Vectors.
+    """
+    __slots__ = ()
+
+    def __init__(self, value: list | np.ndarray, dtype=str):
+        if isinstance(value, Vector):
+            value = value.raw_value
+        elif isinstance(value, (list, tuple)):
+            value = [item.value if isinstance(item, String) else item for item in value]
+        self.raw_value = np.asarray(value).astype(dtype, copy=False)
+        if self.raw_value.shape == ():
+            raise ValueError("Vector must have at least one dimension")
+
+    def _operand(self, other):
+        if isinstance(other, String):
+            return other.value
+        elif isinstance(other, str):
+            return other
+        elif isinstance(other, list):
+            return np.array([item.value if isinstance(item, String) else item for item in other], dtype=str)
+        return super()._operand(other)
+
+    def _elementwise(self, ufunc, other, reflected=False, typed=True):
+        other = self._operand(other)
+        a, b = (other, self.raw_value) if reflected else (self.raw_value, other)
+        result = elementwise(ufunc, a, b)
+        if result.dtype.kind in "UT":
+            return StringVector._from_raw(result)
+        return Vector._from_raw(result)
+
+    def _inplace_elementwise(self, ufunc, other):
+        # concatenation changes the element width, so `+=` rebinds to a new StringVector
+        return self._elementwise(ufunc, other)
+
+    def lengths(self) -> Vector:
+        """Length of every string."""
+        return Vector._from_raw(np.strings.str_len(self.raw_value))
+
+    def __contains__(self, item):
+        return self._operand(item) in self.raw_value
+
+    def __repr__(self):
+        return f"StringVector({self.value})"
+
+
+def vec(value):
+    return Vector(value)
+
+def string_array(value):
+    return StringVector(value)
+
+def dot(a: Vector, b: Vector) -> Vector:
+    return a.dot(b)
+
+
+def array_result(value, cls: type = Vector):
+    # 0-d results (vector @ vector, full contractions) keep their width, see `reduction_result`
+    if np.ndim(value) == 0:
+        return reduction_result(value)
+    return cls._from_raw(value)
+
+
+def reduction_result(value):
+    # scalars keep their width: a uint8 sum is an UnsignedInteger8, a float32 max a Real32
+    if np.ndim(value) == 0:
+        value = np.asarray(value)
+        cls = SCALAR_TYPES.get(value.dtype.newbyteorder("="))  # e.g. a max over a big-endian column
+        if cls is None:
+            return autotype(value.item())
+        return cls._from_raw(value.item())
+    return Vector._from_raw(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def contraction_plan(spec: str, shapes: tuple) -> list:
+    """Return the `np.einsum` contraction path for `spec` over operands of `shapes`."""
+    # einsum_path only reads the shapes, so zero-strided views stand in for the data
+    operands = [np.broadcast_to(0.0, shape) for shape in shapes]
+    optimize = "optimal" if len(shapes) <= 4 else "greedy"
+    return np.einsum_path(spec, *operands, optimize=optimize)[0]
+
+
+# ==============================
+# cast dispatch table
+# ==============================
+NUMBER_TYPES = (
+    Boolean,
+    Integer, Integer8, Integer16, Integer32, Integer64,
+    UnsignedInteger8, UnsignedInteger16, UnsignedInteger32, UnsignedInteger64,
+    Real, Real32, Real64,
+    Complex, Complex64, Complex128,
+    Vector,
+)
+
+SCALAR_TYPES = {
+    np.dtype(np.bool_): Boolean,
+    np.dtype(np.int8): Integer8,
+    np.dtype(np.int16): Integer16,
+    np.dtype(np.int32): Integer32,
+    np.dtype(np.int64): Integer64,
+    np.dtype(np.uint8): UnsignedInteger8,
+    np.dtype(np.uint16): UnsignedInteger16,
+    np.dtype(np.uint32): UnsignedInteger32,
+    np.dtype(np.uint64): UnsignedInteger64,
+    np.dtype(np.float32): Real32,
+    np.dtype(np.float64): Real64,
+    np.dtype(np.complex64): Complex64,
+    np.dtype(np.complex128): Complex128,
+}
+
+NATIVE_CAST_TYPES = {
+    int: Integer,
+    bool: Integer,  # bool is an int subclass, so `_cast_fallback` takes the int branch
+    float: Real,
+    complex: Complex,
+    list: Vector,
+}
+
+
+def build_cast_table() -> dict:
+    """Build `(type(self), type(other)) -> (coercer, result_type)` for `Number.cast`.
+
+    Each coercer returns the same pair that `Number._cast_fallback` would, and
+    `result_type` is the type of the left operand after coercion.
+    """
+    def keep(self, other):
+        return self, other
+
+    def swap(self, other):
+        return other, self
+
+    def defer(self, other):
+        raise DeferredOperand()
+
+    def to_self(target):
+        def coercer(self, other):
+            return self, target._from_raw(other.raw_value)
+        return coercer
+
+    def to_other(target):
+        def coercer(self, other):
+            return other, target._from_raw(self.raw_value)
+        return coercer
+
+    def wrap_native(target):
+        def coercer(self, other):
+            return self, target._from_raw(other)
+        return coercer
+
+    def exact_native(target):
+        # a Python int keeps its exact value as an operand, so uint64(-1) == 2 ** 64 - 1;
+        # the operator result is still wrapped to its own type
+        def coercer(self, other):
+            operand = target.__new__(target)
+            operand.raw_value = other
+            return self, operand
+        return coercer
+
+    native_coercers = {native: wrap_native(target) for native, target in NATIVE_CAST_TYPES.items()}
+    native_coercers[int] = exact_native(Integer)
+
+    table = {}
+    for left in NUMBER_TYPES:
+        for native, coercer in native_coercers.items():
+            table[left, native] = (coercer, left)
+        for right in NUMBER_TYPES:
+            if right is Vector:
+                table[left, right] = (keep, left) if left is Vector else (defer, right)
+            elif right.priority > left.priority:
+                # mirrors `other.cast(self)`: the higher priority operand goes first
+                if left is Vector:
+                    table[left, right] = (swap, right)
+                else:
+                    table[left, right] = (to_other(right), right)
+            else:
+                table[left, right] = (to_self(left), left)
+    return table
+
+
+CAST_TABLE = build_cast_table()
+
+# ==============================
+# interning
+# ==============================
+INTERNED_TYPES = (
+    Boolean,
+    Integer, Integer8, Integer16, Integer32, Integer64,
+    UnsignedInteger8, UnsignedInteger16, UnsignedInteger32, UnsignedInteger64,
+)
+
+
+def enable_interning(low: int = -5, high: int = 256):
+    """Share one immutable instance per value in `low..high` for Boolean and the Integer types.
+
+    While enabled, in-place operators on these types return a new instance
+    instead of mutating, and assigning `value` or `raw_value` of a cached
+    instance raises AttributeError, so it can never change under its users.
+    """
+    disable_interning()
+    for cls in INTERNED_TYPES:
+        values = (False, True) if cls is Boolean else range(low, high + 1)
+        cache = {value: cls(value) for value in values}
+        cls.intern_cache = cache
+        cls.interned_ids = frozenset(id(instance) for instance in cache.values())
+        cls.__setattr__ = interned_setattr
+    Interned.__call__ = interned_call
+
+
+def disable_interning():
+    if "__call__" in Interned.__dict__:
+        del Interned.__call__
+    for cls in INTERNED_TYPES:
+        cls.intern_cache = None
+        cls.interned_ids = frozenset()
+        if "__setattr__" in cls.__dict__:
+            del cls.__setattr__
+
+
+# ==============================
+# profiling
+# ==============================
+PROFILED_OPERATORS = (
+    "__add__", "__radd__", "__sub__", "__rsub__", "__mul__", "__rmul__",
+    "__truediv__", "__rtruediv__", "__floordiv__", "__rfloordiv__",
+    "__mod__", "__rmod__", "__pow__", "__rpow__",
+    "__iadd__", "__isub__", "__imul__", "__itruediv__", "__ifloordiv__", "__imod__", "__ipow__",
+    "__ilshift__", "__irshift__", "__iand__", "__ixor__", "__ior__",
+    "__eq__", "__ne__", "__lt__", "__gt__", "__le__", "__ge__",
+    "__and__", "__rand__", "__or__", "__ror__", "__xor__", "__rxor__",
+    "__lshift__", "__rlshift__", "__rshift__", "__rrshift__",
+    "__neg__", "__pos__", "__abs__", "__invert__",
+)
+
+
+class Profile:
+    """Per `(operator, left type, right type)` call counts and timings, filled in by `profile()`.
+
+    Each entry holds `calls`, `total` (inclusive seconds) and the exclusive
+    buckets `operator`, `coercion` (`Number.cast`), `construction` (`__init__`
+    and `_from_raw`) and `numpy` (ufunc kernels). Work done outside any operator is recorded
+    under `(method, type, "")`.
+    """
+
+    buckets = ("operator", "coercion", "construction", "numpy")
+
+    def __init__(self):
+        self.stats = {}
+        self.stack = []  # [key, seconds spent in nested frames]
+
+    def entry(self, key):
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = dict.fromkeys(("calls", "total") + self.buckets, 0.0)
+            entry["calls"] = 0
+        return entry
+
+    def call(self, bucket, key, function, args, kwargs):
+        parent = self.stack[-1] if self.stack else None
+        if bucket != "operator" and parent is not None:
+            key = parent[0]  # coercion/construction/numpy time belongs to the running operator
+        frame = [key, 0.0]
+        self.stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stack.pop()
+            if parent is not None:
+                parent[1] += elapsed
+            entry = self.entry(key)
+            entry[bucket] += elapsed - frame[1]
+            if bucket == "operator" or parent is None:
+                entry["calls"] += 1
+                entry["total"] += elapsed
+
+    def wrap(self, bucket, name, function):
+        profile = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # classmethods (`_from_raw`) get the class itself as their first argument
+            left = args[0].__name__ if isinstance(args[0], type) else type(args[0]).__name__
+            right = type(args[1]).__name__ if len(args) > 1 else ""
+            return profile.call(bucket, (name, left, right), function, args, kwargs)
+        return wrapper
+
+    def report(self, limit: int | None = None) -> str:
+        header = f"{'operator':<16}{'left':<20}{'right':<20}{'calls':>9}{'total[s]':>11}" + \
+            "".join(f"{bucket + '[s]':>16}" for bucket in self.buckets)
+        lines = [header]
+        ranked = sorted(self.stats.items(), key=lambda item: item[1]["total"], reverse=True)
+        for (name, left, right), entry in ranked[:limit]:
+            lines.append(f"{name:<16}{left:<20}{right:<20}{entry['calls']:>9}{entry['total']:>11.6f}" +
+                         "".join(f"{entry[bucket]:>16.6f}" for bucket in self.buckets))
+        return "\n".join(lines)
+
+
+def number_classes() -> list:
+    classes, pending = [], [Number]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+@contextlib.contextmanager
+def profile():
+    """Count and time every Number operator while the block runs.
+
+    The methods are swapped for timing wrappers on entry and restored on exit,
+    so nothing is added to the operators while profiling is off.
+
+        with profile() as p:
+            ...
+        print(p.report())
+    """
+    result = Profile()
+    patched = []
+    for cls in number_classes():
+        for name in PROFILED_OPERATORS + ("cast", "__init__", "_from_raw"):
+            if name in cls.__dict__:
+                bucket = {"cast": "coercion", "__init__": "construction", "_from_raw": "construction"}.get(
+                    name, "operator")
+                original = cls.__dict__[name]
+                if isinstance(original, classmethod):
+                    wrapped = classmethod(result.wrap(bucket, name, original.__func__))
+                else:
+                    wrapped = result.wrap(bucket, name, original)
+                setattr(cls, name, wrapped)
+                patched.append((cls, name, original))
+    global elementwise
+    original_elementwise = elementwise
+
+    def profiled_elementwise(ufunc, a, b, *args):
+        key = (ufunc.__name__, type(a).__name__, type(b).__name__)
+        return result.call("numpy", key, original_elementwise, (ufunc, a, b) + args, {})
+
+    elementwise = profiled_elementwise
+    try:
+        yield result
+    finally:
+        elementwise = original_elementwise
+        for cls, name, original in patched:
+            setattr(cls, name, original)
+
+
+# ==============================
+# process pool
+# ==============================
+def raw_dtype(cls: type) -> np.dtype | None:
+    """numpy dtype that holds the raw values of `cls` exactly, or None for Python objects."""
+    if cls is bool or cls is Boolean:
+        return np.dtype(np.bool_)
+    elif cls is int or (isinstance(cls, type) and issubclass(cls, Integer)):
+        return np.dtype(cls.dtype if getattr(cls, "bits", None) else np.int64)
+    elif cls is Real32:
+        return np.dtype(np.float32)
+    elif cls is float or cls in (Real, Real64):
+        return np.dtype(np.float64)
+    elif cls is Complex64:
+        return np.dtype(np.complex64)
+    elif cls is complex or cls in (Complex, Complex128):
+        return np.dtype(np.complex128)
+    return None
+
+
+def encode_column(values: list) -> tuple:
+    # a column of one scalar type travels as `(type, array of raw values)`;
+    # anything else is pickled as is
+    kind = type(values[0]) if values else None
+    dtype = raw_dtype(kind)
+    if dtype is not None and all(type(value) is kind for value in values):
+        raws = [value.raw_value for value in values] if issubclass(kind, Number) else values
+        try:
+            return kind, np.array(raws, dtype=dtype)
+        except OverflowError:
+            pass  # a Python int outside int64
+    return None, values
+
+
+def decode_column(column: tuple) -> list:
+    kind, payload = column
+    if kind is None:
+        return payload
+    raws = payload.tolist()
+    if issubclass(kind, Number):
+        return [kind._from_raw(raw) for raw in raws]
+    return raws
+
+
+def map_batch(function, size: int, columns: list, rows: list | None = None) -> tuple:
+    # `rows` is only sent for batches whose argument tuples differ in length
+    if rows is None:
+        rows = zip(*map(decode_column, columns)) if columns else [()] * size
+    return encode_column([function(*row) for row in rows])
+
+
+def parallel_map(function, iterable_of_args, workers: int | None = None, batch_size: int | None = None) -> list:
+    """Return `[function(*args) for args in iterable_of_args]`, computed on a process pool.
+
+    Each item is a tuple of arguments, or a single argument. Arguments are
+    sent in batches, one numpy array of raw values per argument position when
+    the position holds a single scalar type, and results come back the same
+    way and are rebuilt as their typed classes. `function` must be picklable,
+    i.e. defined at module level. `workers` defaults to the number of CPUs.
+    """
+    rows = [args if type(args) is tuple else (args,) for args in iterable_of_args]
+    workers = workers or os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, math.ceil(len(rows) / (workers * 4)))
+    batches = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if len(set(map(len, batch))) > 1:
+            batches.append((function, len(batch), [], batch))
+        else:
+            batches.append((function, len(batch), [encode_column(list(column)) for column in zip(*batch)], None))
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(map_batch, *zip(*batches)) if batches else []
+        return [value for column in results for value in decode_column(column)]
+
+
+class Tuple(Generic):
+    __slots__ = ()
+
+    def __init__(self, value: list | tuple):
+        self.value = tuple(value)
+
+    def __repr__(self):
+        return f"Tuple({self.value})"
+
+    def __getitem__(self, item):
+        return self.value[item]
+
+    def __setitem__(self, key, value):
+        self.value[key] = value
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __next__(self):
+        return next(self.value)
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __index__(self):
+        return self.value.__index__()
+
+    def __reversed__(self):
+        return reversed(self.value)
+
+
+class RecordType:
+    """Layout of a fixed-size binary record, declared with the typed classes.
+
+        Packet = RecordType([("kind", UnsignedInteger8), ("length", Integer16),
+                             ("id", UnsignedInteger32), ("level", Real32)], byteorder="big")
+        packets = Packet.from_buffer(data)  # no copy
+        packets["length"]                   # Integer16 column as a Vector
+        packets[0]["id"]                    # UnsignedInteger32
+
+    `byteorder` is "little", "big" or "=" (native). Fields are packed without
+    padding unless `aligned` is true.
+    """
+
+    def __init__(self, fields: list, byteorder: str = "=", aligned: bool = False):
+        self.fields = dict(fields)
+        layout = []
+        for name, cls in fields:
+            dtype = raw_dtype(cls)
+            if dtype is None:
+                raise UnsupportedTypeError(cls)
+            layout.append((name, dtype.newbyteorder(byteorder)))
+        self.dtype = np.dtype(layout, align=aligned)
+
+    @property
+    def itemsize(self) -> int:
+        return self.dtype.itemsize
+
+    def from_buffer(self, buffer, count: int = -1, offset: int = 0) -> "RecordVector":
+        """Decode `count` records (all by default) from a bytes-like object without copying it."""
+        return RecordVector(self, np.frombuffer(buffer, dtype=self.dtype, count=count, offset=offset))
+
+    def array(self, rows: list) -> "RecordVector":
+        """Build records from rows of values, wrapping each one with its field's class first."""
+        classes = list(self.fields.values())
+        rows = [tuple(cls(value).raw_value for cls, value in zip(classes, row, strict=True)) for row in rows]
+        return RecordVector(self, np.array(rows, dtype=self.dtype))
+
+    def __repr__(self):
+        return f"RecordType({list(self.fields.items())})"
+
+
+class RecordVector(Generic):
+    """Records of one RecordType over a numpy structured array.
+
+    A field name gives that field as a Vector view, an index a Record, and a
+    slice another RecordVector sharing the same memory.
+    """
+    __slots__ = ("record_type",)
+
+    def __init__(self, record_type: RecordType, value: np.ndarray):
+        self.record_type = record_type
+        self.value = value
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return Vector._from_raw(self.value[item])
+        value = self.value[item]
+        if isinstance(value, np.ndarray):
+            return RecordVector(self.record_type, value)
+        return Record(self.record_type, value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return (Record(self.record_type, value) for value in self.value)
+
+    def __bytes__(self):
+        return self.value.tobytes()
+
+    def __repr__(self):
+        return f"RecordVector({len(self)} x {list(self.record_type.fields)})"
+
+
+class Record(Tuple):
+    """One record: a Tuple of typed scalars that reads and writes through to its RecordVector."""
+    __slots__ = ("record_type",)
+
+    def __init__(self, record_type: RecordType, value: np.void):
+        self.record_type = record_type
+        self.value = value
+
+    def _field(self, item) -> str:
+        return item if isinstance(item, str) else self.value.dtype.names[item]
+
+    def __getitem__(self, item):
+        name = self._field(item)
+        return self.record_type.fields[name]._from_raw(self.value[name].item())
+
+    def __setitem__(self, key, value):
+        name = self._field(key)
+        # the typed constructor wraps out-of-range values first
+        self.value[name] = self.record_type.fields[name](value).raw_value
+
+    def __len__(self):
+        return len(self.record_type.fields)
+
+    def __iter__(self):
+        return (self[name] for name in self.record_type.fields)
+
+    def __contains__(self, item):
+        return any(field == item for field in self)
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __repr__(self):
+        return "Record(" + ", ".join(f"{name}={self[name]}" for name in self.record_type.fields) + ")"
+
+
+# ==============================
+# binary serialization
+# ==============================
+# The tag of a type is its position here; only append, tags are stored in files.
+SERIAL_TYPES = (
+    Boolean,
+    Integer, Integer8, Integer16, Integer32, Integer64,
+    UnsignedInteger8, UnsignedInteger16, UnsignedInteger32, UnsignedInteger64,
+    Real, Real32, Real64,
+    Complex, Complex64, Complex128,
+    Vector, StringVector, String,
+)
+SERIAL_TAGS = {cls: tag for tag, cls in enumerate(SERIAL_TYPES)}
+
+# fixed-width little-endian payloads of the scalar types
+SERIAL_STRUCTS = {
+    Boolean: struct.Struct("<?"), Integer: struct.Struct("<q"),
+    Integer8: struct.Struct("<b"), Integer16: struct.Struct("<h"),
+    Integer32: struct.Struct("<i"), Integer64: struct.Struct("<q"),
+    UnsignedInteger8: struct.Struct("<B"), UnsignedInteger16: struct.Struct("<H"),
+    UnsignedInteger32: struct.Struct("<I"), UnsignedInteger64: struct.Struct("<Q"),
+    Real: struct.Struct("<d"), Real32: struct.Struct("<f"), Real64: struct.Struct("<d"),
+    Complex: struct.Struct("<dd"), Complex64: struct.Struct("<ff"), Complex128: struct.Struct("<dd"),
+}
+SERIAL_LENGTH = struct.Struct("<I")
+SERIAL_DIMENSION = struct.Struct("<Q")
+
+
+def serial_type(value) -> type:
+    for cls in type(value).__mro__:
+        if cls in SERIAL_TAGS:
+            return cls
+    raise UnsupportedTypeError(type(value))
+
+
+def encode(value) -> list:
+    """Return the encoding of `value` as a list of bytes-like parts (array data is not copied).
+
+    Layout: one tag byte, then
+      scalars: the fixed-width little-endian value (Complex: real, imag)
+      String:  uint32 byte count + UTF-8
+      Vector:  uint8 length + numpy dtype string, uint8 ndim, uint64 per
+               dimension, then the elements in C order, little-endian
+    """
+    cls = serial_type(value)
+    tag = bytes((SERIAL_TAGS[cls],))
+    if cls in SERIAL_STRUCTS:
+        raw = value.raw_value
+        if issubclass(cls, Complex):
+            return [tag, SERIAL_STRUCTS[cls].pack(raw.real, raw.imag)]
+        return [tag, SERIAL_STRUCTS[cls].pack(raw)]
+    elif cls is String:
+        payload = value.value.encode("utf-8")
+        return [tag, SERIAL_LENGTH.pack(len(payload)), payload]
+    array = value.raw_value
+    if array.dtype.hasobject or array.dtype.kind not in "biufcU":
+        raise UnsupportedTypeError(array.dtype)
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    dtype = array.dtype.str.encode("ascii")
+    header = bytes((len(dtype),)) + dtype + bytes((array.ndim,)) + \
+        b"".join(SERIAL_DIMENSION.pack(size) for size in array.shape)
+    return [tag, header, array.reshape(-1).view(np.uint8).data]
+
+
+SERIAL_CHUNK = 1 << 20  # sizes come from the input, so large reads grow with the data actually read
+
+
+def read_exactly(stream, size: int) -> bytes:
+    if size <= SERIAL_CHUNK:
+        data = stream.read(size)
+    else:
+        data = bytearray()
+        while len(data) < size and (chunk := stream.read(min(size - len(data), SERIAL_CHUNK))):
+            data += chunk
+    if len(data) != size:
+        raise EOFError("Truncated data")
+    return data
+
+
+def read_array(stream, dtype: np.dtype, shape: tuple) -> np.ndarray:
+    size = math.prod(shape) * dtype.itemsize
+    seekable = getattr(stream, "seekable", None)
+    if seekable is None or not seekable():
+        return np.frombuffer(bytearray(read_exactly(stream, size)), dtype=dtype).reshape(shape)
+    # check the header against the stream length before allocating the array
+    position = stream.tell()
+    left = stream.seek(0, io.SEEK_END) - position
+    stream.seek(position)
+    if size > left:
+        raise EOFError("Truncated data")
+    array = np.empty(shape, dtype=dtype)
+    if stream.readinto(array.reshape(-1).view(np.uint8)) != size:
+        raise EOFError("Truncated data")
+    return array
+
+
+def decode(stream):
+    """Read one value written by `encode` from a binary stream, or return None at the end."""
+    tag = stream.read(1)
+    if not tag:
+        return None
+    if tag[0] >= len(SERIAL_TYPES):
+        raise ValueError(f"Unknown type tag {tag[0]}")
+    cls = SERIAL_TYPES[tag[0]]
+    if cls in SERIAL_STRUCTS:
+        layout = SERIAL_STRUCTS[cls]
+        fields = layout.unpack(read_exactly(stream, layout.size))
+        raw = complex(*fields) if issubclass(cls, Complex) else fields[0]
+        return cls._from_raw(raw)
+    elif cls is String:
+        size, = SERIAL_LENGTH.unpack(read_exactly(stream, SERIAL_LENGTH.size))
+        return String(read_exactly(stream, size).decode("utf-8"))
+    dtype = np.dtype(bytes(read_exactly(stream, read_exactly(stream, 1)[0])).decode("ascii"))
+    if dtype.hasobject or dtype.kind not in "biufcU":
+        raise ValueError(f"Unsupported dtype {dtype}")
+    ndim = read_exactly(stream, 1)[0]
+    shape = tuple(SERIAL_DIMENSION.unpack(read_exactly(stream, SERIAL_DIMENSION.size))[0] for _ in range(ndim))
+    return cls._from_raw(read_array(stream, dtype, shape))
+
+
+def to_bytes(value) -> bytes:
+    return b"".join(encode(value))
+
+
+def from_bytes(data) -> "Number | String":
+    stream = io.BytesIO(data)
+    value = decode(stream)
+    if value is None:
+        raise EOFError("No data")
+    if stream.read(1):
+        raise ValueError("Trailing bytes after the encoded value")
+    return value
+
+
+def dump_many(values, stream):
+    """Write every value of `values` to a binary stream, one encoding after the other."""
+    for value in values:
+        for part in encode(value):
+            stream.write(part)
+
+
+def load_many(stream):
+    """Yield the values written by `dump_many` until the stream ends."""
+    while (value := decode(stream)) is not None:
+        yield value
+
+
+# ==============================
+# numpy protocols
+# ==============================
+# Types with an explicit width reach numpy as numpy scalars, so np.add(uint8, uint8)
+# stays uint8; Boolean, Integer, Real and Complex stay Python scalars like int and float.
+ARRAY_SCALARS = {
+    cls: dtype.type for dtype, cls in SCALAR_TYPES.items() if cls is not Boolean
+}
+ARRAY_DTYPES = {cls: raw_dtype(cls) for cls in NUMBER_TYPES if cls is not Vector}
+
+
+def array_unwrap(value):
+    # Numbers inside numpy function arguments (also in lists, tuples and dicts) become raw values
+    if isinstance(value, Vector):
+        return value.raw_value
+    elif isinstance(value, Number):
+        scalar = ARRAY_SCALARS.get(type(value))
+        return scalar(value.raw_value) if scalar is not None else value.raw_value
+    elif type(value) in (list, tuple):
+        return type(value)(array_unwrap(item) for item in value)
+    elif type(value) is dict:
+        return {key: array_unwrap(item) for key, item in value.items()}
+    return value
+
+
+def vectors_in(value):
+    # the Vectors in numpy function arguments or results, also inside lists, tuples and dicts
+    if isinstance(value, Vector):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from vectors_in(item)
+    elif type(value) is dict:
+        for item in value.values():
+            yield from vectors_in(item)
+
+
+def array_wrap(value, classes=()):
+    """Wrap a numpy result: arrays as Vectors, scalars as the input class with the same dtype.
+
+    A scalar whose dtype matches none of `classes` is typed by `reduction_result`.
+    """
+    if isinstance(value, np.ndarray) and value.ndim > 0:
+        if value.dtype.kind in "UT":
+            return StringVector._from_raw(value)
+        return Vector._from_raw(value)
+    elif isinstance(value, (np.ndarray, np.generic)):
+        for cls in classes:
+            if ARRAY_DTYPES.get(cls) == value.dtype:
+                return cls._from_raw(value.item())
+        return reduction_result(value)
+    return value
+
+
+def array_wrap_all(value):
+    # results of numpy functions: also the arrays in returned lists, tuples and named tuples
+    if type(value) is list:
+        return [array_wrap_all(item) for item in value]
+    elif isinstance(value, tuple):
+        items = [array_wrap_all(item) for item in value]
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+    return array_wrap(value)
+
+
+class Undefined:
+    """Symbolic stand-in recorded by `vectorize`.
+
+    Every operator applied to an Undefined returns a new Undefined and appends
+    it to the shared `trace`, so the trace lists the operations in evaluation order.
+    """
+
+    def __init__(self, symbol, operator=None, operands=(), trace=None):
+        self.symbol = symbol
+        self.operator = operator
+        self.operands = operands
+        self.trace = [] if trace is None else trace
+        if operator is not None:
+            self.trace.append(self)
+
+    def __repr__(self):
+        return "Undefined symbol: " + self.symbol
+
+    def __bool__(self):
+        raise TypeError(f"Cannot branch on the traced value `{self.symbol}`")
+
+    def apply(self, symbol, *operands):
+        text = f" {symbol} ".join(o.symbol if isinstance(o, Undefined) else repr(o) for o in operands)
+        if len(operands) == 1:
+            text = symbol + text
+        return Undefined(f"({text})", Operator(symbol), operands, self.trace)
+
+    def __add__(self, other):
+        return self.apply("+", self, other)
+
+    def __radd__(self, other):
+        return self.apply("+", other, self)
+
+    def __sub__(self, other):
+        return self.apply("-", self, other)
+
+    def __rsub__(self, other):
+        return self.apply("-", other, self)
+
+    def __mul__(self, other):
+        return self.apply("*", self, other)
+
+    def __rmul__(self, other):
+        return self.apply("*", other, self)
+
+    def __truediv__(self, other):
+        return self.apply("/", self, other)
+
+    def __rtruediv__(self, other):
+        return self.apply("/", other, self)
+
+    def __floordiv__(self, other):
+        return self.apply("//", self, other)
+
+    def __rfloordiv__(self, other):
+        return self.apply("//", other, self)
+
+    def __mod__(self, other):
+        return self.apply("%", self, other)
+
+    def __rmod__(self, other):
+        return self.apply("%", other, self)
+
+    def __pow__(self, other):
+        return self.apply("**", self, other)
+
+    def __rpow__(self, other):
+        return self.apply("**", other, self)
+
+    def __and__(self, other):
+        return self.apply("&", self, other)
+
+    def __rand__(self, other):
+        return self.apply("&", other, self)
+
+    def __or__(self, other):
+        return self.apply("|", self, other)
+
+    def __ror__(self, other):
+        return self.apply("|", other, self)
+
+    def __xor__(self, other):
+        return self.apply("^", self, other)
+
+    def __rxor__(self, other):
+        return self.apply("^", other, self)
+
+    def __lshift__(self, other):
+        return self.apply("<<", self, other)
+
+    def __rlshift__(self, other):
+        return self.apply("<<", other, self)
+
+    def __rshift__(self, other):
+        return self.apply(">>", self, other)
+
+    def __rrshift__(self, other):
+        return self.apply(">>", other, self)
+
+    def __eq__(self, other):
+        return self.apply("==", self, other)
+
+    def __ne__(self, other):
+        return self.apply("!=", self, other)
+
+    def __lt__(self, other):
+        return self.apply("<", self, other)
+
+    def __le__(self, other):
+        return self.apply("<=", self, other)
+
+    def __gt__(self, other):
+        return self.apply(">", self, other)
+
+    def __ge__(self, other):
+        return self.apply(">=", self, other)
+
+    def __neg__(self):
+        return self.apply("-", self)
+
+    def __pos__(self):
+        return self.apply("+", self)
+
+    def __abs__(self):
+        return self.apply("abs", self)
+
+    def __invert__(self):
+        return self.apply("~", self)
+
+
+class Operator:
+    binary = {
+        "+": np.add, "-": np.subtract, "*": np.multiply, "/": np.true_divide,
+        "//": np.floor_divide, "%": np.remainder, "**": np.power,
+        "&": np.bitwise_and, "|": np.bitwise_or, "^": np.bitwise_xor,
+        "<<": np.left_shift, ">>": np.right_shift,
+        "==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+        ">": np.greater, ">=": np.greater_equal,
+    }
+    unary = {"-": np.negative, "+": np.positive, "abs": np.absolute, "~": np.invert}
+    # the same operations on Numbers, with their own result types
+    scalar_binary = {
+        "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+        "//": operator.floordiv, "%": operator.mod, "**": operator.pow,
+        "&": operator.and_, "|": operator.or_, "^": operator.xor,
+        "<<": operator.lshift, ">>": operator.rshift,
+        "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+        ">": operator.gt, ">=": operator.ge,
+    }
+    scalar_unary = {"-": operator.neg, "+": operator.pos, "abs": abs, "~": operator.invert}
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def __repr__(self):
+        return f"Operator({self.symbol})"
+
+    def __call__(self, *operands):
+        if len(operands) == 1:
+            return self.unary[self.symbol](*operands)
+        return self.binary[self.symbol](*operands)
+
+    def scalar(self, *operands):
+        if len(operands) == 1:
+            return self.scalar_unary[self.symbol](*operands)
+        return self.scalar_binary[self.symbol](*operands)
+
+
+def replay(trace: list, bindings: list, result, scalar: bool = False) -> tuple:
+    """Evaluate a `vectorize` trace with `(symbol, value)` bindings for its inputs.
+
+    The inputs are arrays and every operation is a numpy ufunc on raw values,
+    or, with `scalar=True`, Numbers and the Number operators. Returns the
+    result and the values of every node, keyed by id.
+    """
+    values = {id(symbol): value for symbol, value in bindings}
+
+    def lookup(operand):
+        if isinstance(operand, Undefined):
+            return values[id(operand)]
+        elif isinstance(operand, Number) and not scalar:
+            # constants keep their width: UnsignedInteger8(250) + k is a uint8 operation
+            return array_unwrap(operand)
+        return operand
+
+    for node in trace:
+        operands = [lookup(operand) for operand in node.operands]
+        values[id(node)] = node.operator.scalar(*operands) if scalar else node.operator(*operands)
+    return lookup(result), values
+
+
+def vectorize(function):
+    """Trace `function` once with Undefined arguments and replay it over arrays.
+
+    `function` is written against scalar Real/Integer/Complex operators and must
+    not branch on its arguments. The returned function takes arrays (or Vectors)
+    and evaluates every input in one pass of numpy operations.
+
+    Each call first replays the trace once on the first elements as Numbers.
+    If any operation gives a different type than numpy does (uint8 + int64
+    stays uint8, Integer // Integer is a Real), every element goes through
+    `function` one by one instead, so results always match the scalar code.
+    """
+    names = list(inspect.signature(function).parameters)
+    trace = []
+    symbols = [Undefined(name, trace=trace) for name in names]
+    result = function(*symbols)
+
+    @functools.wraps(function)
+    def vectorized(*args):
+        if len(args) != len(symbols):
+            raise TypeError(f"{function.__name__}() takes {len(symbols)} arguments, got {len(args)}")
+        arrays = [array_unwrap(arg) if isinstance(arg, Number) else np.asarray(arg) for arg in args]
+        classes = [type(arg) if isinstance(arg, Number) and not isinstance(arg, Vector)
+                   else SCALAR_TYPES.get(np.result_type(array)) for arg, array in zip(args, arrays)]
+        shape = np.broadcast_shapes(*map(np.shape, arrays))
+        size = math.prod(shape)
+
+        def element(index):
+            return [cls._from_raw(np.broadcast_to(array, shape).flat[index].item())
+                    for cls, array in zip(classes, arrays)]
+
+        if shape == () and None not in classes:
+            return function(*element(0))
+        value, raw = replay(trace, list(zip(symbols, arrays)), result)
+        if size > 0 and None not in classes:
+            try:
+                _, typed = replay(trace, list(zip(symbols, element(0))), result, scalar=True)
+                exact = all(np.result_type(raw[id(node)]) == ARRAY_DTYPES.get(type(typed[id(node)]))
+                            for node in trace)
+            except Exception:
+                exact = False
+            if not exact:
+                values = [function(*element(index)) for index in range(size)]
+                dtype = ARRAY_DTYPES.get(type(values[0]))
+                return Vector._from_raw(np.array([value.raw_value for value in values], dtype=dtype).reshape(shape))
+        value = np.asarray(value)
+        if value.shape == ():
+            return reduction_result(value)
+        if any(node is result for node in trace):
+            return Vector._from_raw(value)  # the fresh array of the last operation
+        return Vector(value)  # `function` returned an argument or a constant: copy it
+
+    vectorized.trace = trace
+    return vectorized
+
+
+def autotype(value: int | float | bool | complex | str | list):
+    if isinstance(value, int) or is_np_int(value):
+        return Integer(value)
+    elif isinstance(value, float) or is_np_float(value):
+        return Real(value)
+    elif isinstance(value, complex) or is_np_complex(value):
+        return Complex(value)
+    elif isinstance(value, bool) or is_np_bool(value):
+        return Boolean(value)
+    elif isinstance(value, str):
+        return String(value)
+    elif isinstance(value, list):
+        return Vector(value)
+    # elif isinstance(value, tuple):
+    #     return Tuple(value)
+    else:
+        raise TypeError(f"Unsupported type: {type(value)}")
+
+
+INTEGER_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64, np.uint64)
+
+
+def autotype_column(values: list | tuple) -> Vector:
+    """Return `values` as one Vector of the narrowest type that holds all of them.
+
+    Integers get the narrowest fixed-width dtype (signed first at each width),
+    floats and complex numbers the 32-bit dtype when it is exact. None in a
+    numeric column becomes nan. Strings give a StringVector. Integers that no
+    64-bit dtype holds give an object column of Python ints.
+    """
+    all_kinds = set(map(type, values))
+    nullable = type(None) in all_kinds
+    kinds = all_kinds - {type(None)}
+    if not kinds:
+        raise TypeError("Cannot infer a type from an empty or all-None column")
+    elif kinds == {bool} and not nullable:
+        return Vector._from_raw(np.array(values, dtype=np.bool_))
+    elif kinds <= {int, bool} and not nullable:
+        try:
+            array = np.array(values, dtype=np.int64)
+        except OverflowError:
+            try:
+                array = np.array(values, dtype=np.uint64)
+            except OverflowError:
+                # mixes negatives with values above int64, or needs more than 64 bits
+                return Vector._from_raw(np.array([int(value) for value in values], dtype=object))
+        low, high = array.min(initial=0), array.max(initial=0)
+        for dtype in INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return Vector._from_raw(array.astype(dtype))
+    elif kinds <= {int, bool, float, complex}:
+        wide, narrow = (np.complex128, np.complex64) if complex in kinds else (np.float64, np.float32)
+        if nullable:
+            values = [np.nan if value is None else value for value in values]
+        array = np.array(values, dtype=wide)
+        narrowed = array.astype(narrow)
+        if np.array_equal(narrowed, array, equal_nan=True):
+            return Vector._from_raw(narrowed)
+        return Vector._from_raw(array)
+    elif kinds == {str} and not nullable:
+        return StringVector._from_raw(np.array(values, dtype=str))
+    raise TypeError(f"Unsupported column types: {sorted(kind.__name__ for kind in all_kinds)}")
+
+
+def autotype_columns(rows: list) -> list | dict:
+    """Type a table column by column instead of cell by cell.
+
+    `rows` is a list of equal-length sequences, giving a list of Vectors, or a
+    list of dicts (parsed JSON records), giving a dict of Vectors with every key
+    of every row, in the order they first appear. A key missing from a row reads
+    as None: nan in a numeric column, a TypeError in any other.
+    """
+    if rows and isinstance(rows[0], dict):
+        names = dict.fromkeys(name for row in rows for name in row)
+        return {name: autotype_column([row.get(name) for row in rows]) for name in names}
+    if len(set(map(len, rows))) > 1:
+        raise ValueError("Rows must all have the same length")
+    return [autotype_column(column) for column in zip(*rows)]
@@ -17,13 +17,102 @@ def f2():
     p *= 4
     return p
 
-# 計測
-elapsed_time_f1 = timeit.timeit(f1, number=1)
-elapsed_time_f2 = timeit.timeit(f2, number=1)
+if __name__ == "__main__":
+    # 計測
+    elapsed_time_f1 = timeit.timeit(f1, number=1)
+    elapsed_time_f2 = timeit.timeit(f2, number=1)
 
-print("f1: " + str(elapsed_time_f1) + "[sec]")
-print("f2: " + str(elapsed_time_f2) + "[sec]")
-print("f2/f1: " + str(elapsed_time_f2/elapsed_time_f1))
+    print("f1: " + str(elapsed_time_f1) + "[sec]")
+    print("f2: " + str(elapsed_time_f2) + "[sec]")
+    print("f2/f1: " + str(elapsed_time_f2/elapsed_time_f1))
 
-r = f2()
-print(type(r))
+    r = f2()
+    print(type(r))
+
+
+# ===================================== interning small Integer / Boolean
+import tracemalloc
+
+def f3():
+    return [(Integer(k & 1), Boolean(k & 1), uint8(k & 0xFF)) for k in range(100000)]
+
+def allocated_bytes(f):
+    tracemalloc.start()
+    values = f()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+if __name__ == "__main__":
+    elapsed_time_plain = timeit.timeit(f3, number=1)
+    bytes_plain = allocated_bytes(f3)
+    enable_interning()
+    elapsed_time_interned = timeit.timeit(f3, number=1)
+    bytes_interned = allocated_bytes(f3)
+    disable_interning()
+
+    print("construct: " + str(elapsed_time_plain) + "[sec], " + str(bytes_plain) + "[bytes]")
+    print("construct (interned): " + str(elapsed_time_interned) + "[sec], " + str(bytes_interned) + "[bytes]")
+
+
+# ===================================== f2 as a vectorized batch over 10^6 inputs
+@vectorize
+def term(k):
+    return (-1) ** k * (2 * k + 1) / (2 * k + 1)
+
+def f4():
+    return term(np.arange(1000000)).value.sum() * 4
+
+if __name__ == "__main__":
+    elapsed_time_f4 = timeit.timeit(f4, number=1)
+    print("f4 (vectorize, 10^6 terms): " + str(elapsed_time_f4) + "[sec]")
+
+
+# ===================================== Number (op) Number with results built through the public constructors
+def f6():
+    # both operands are Numbers already, so the time goes into the operator and its result
+    a, b = Real(1.5), Real(0.5)
+    i, j = Integer(7), Integer(3)
+    for _ in range(100000):
+        a + b
+        a * b
+        i + j
+        i - j
+        a < b
+
+def checked_from_raw(cls, value):
+    return cls(value)
+
+if __name__ == "__main__":
+    elapsed_time_f6 = min(timeit.repeat(f6, number=1, repeat=5))
+    fast_paths = {cls: cls.__dict__["_from_raw"] for cls in (Number, Boolean)}
+    for cls in fast_paths:
+        cls._from_raw = classmethod(checked_from_raw)
+    elapsed_time_f6_checked = min(timeit.repeat(f6, number=1, repeat=5))
+    for cls, method in fast_paths.items():
+        cls._from_raw = method
+
+    print("f6 (public constructors): " + str(elapsed_time_f6_checked) + "[sec]")
+    print("f6 (_from_raw): " + str(elapsed_time_f6) + "[sec]")
+    print("speedup: " + str(elapsed_time_f6_checked / elapsed_time_f6))
+
+
+# ===================================== f2 split into independent evaluations on a process pool
+# every section runs under `__main__` only: with the spawn and forkserver start
+# methods each worker imports this file again to find f5
+import os
+
+def f5(start, stop):
+    p = real(0)
+    for k in range(int(start), int(stop)):
+        p += (-1) ** k * (2 * k + 1) / (2 * k + 1)
+    return p
+
+if __name__ == "__main__":
+    chunks = [(Integer(start), Integer(start + 10000)) for start in range(0, 400000, 10000)]
+    elapsed_time_serial = timeit.timeit(lambda: [f5(*args) for args in chunks], number=1)
+    elapsed_time_parallel = timeit.timeit(lambda: parallel_map(f5, chunks), number=1)
+
+    print("f5 (serial, 40 evaluations): " + str(elapsed_time_serial) + "[sec]")
+    print("f5 (parallel_map, " + str(os.cpu_count()) + " workers): " + str(elapsed_time_parallel) + "[sec]")
+    print("speedup: " + str(elapsed_time_serial / elapsed_time_parallel))
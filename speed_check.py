@@ -45,3 +45,191 @@ default_plus_time = timeit.timeit(using_default_plus, number=10000)
 print(f"+: {plus_time}")
 print(f"np.add: {np_add_time}")
 print(f"default +: {default_plus_time}")
+
+
+# ===================================== cast: isinstance chain vs dispatch table
+
+a = Real(1.919)
+pairs = [(a, 2.919), (a, 2), (a, Integer(2)), (Integer(2), a), (uint8(1), int16(2))]
+
+def using_cast_chain():
+    for x, y in pairs:
+        x._cast_fallback(y)
+
+def using_cast_table():
+    for x, y in pairs:
+        x.cast(y)
+
+cast_chain_time = timeit.timeit(using_cast_chain, number=10000)
+cast_table_time = timeit.timeit(using_cast_table, number=10000)
+
+print(f"cast (isinstance chain): {cast_chain_time}")
+print(f"cast (dispatch table): {cast_table_time}")
+
+
+# ===================================== a * b + c / d: eager vs lazy (fused)
+import tracemalloc
+
+a, b, c, d = (Vector(np.random.rand(1000000)) for _ in range(4))
+
+def using_eager():
+    return a * b + c / d
+
+def using_lazy():
+    return (a.lazy() * b + c / d).eval()
+
+def peak_bytes(f):
+    tracemalloc.start()
+    f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+eager_time = timeit.timeit(using_eager, number=20)
+lazy_time = timeit.timeit(using_lazy, number=20)
+
+print(f"eager: {eager_time} (peak {peak_bytes(using_eager)} bytes)")
+print(f"lazy: {lazy_time} (peak {peak_bytes(using_lazy)} bytes)")
+
+
+# ===================================== threaded elementwise: speed-up over 1 thread
+import os
+
+a, b = (Vector(np.random.rand(10000000)) for _ in range(2))
+
+def using_threads():
+    return a * b + a
+
+counts = [1]
+while counts[-1] * 2 <= max(os.cpu_count() or 1, 2):
+    counts.append(counts[-1] * 2)
+
+base_time = None
+for workers in counts:
+    enable_threading(workers, threshold=1 << 16)
+    thread_time = timeit.timeit(using_threads, number=10)
+    disable_threading()
+    base_time = base_time or thread_time
+    print(f"{workers} thread(s): {thread_time} (speed-up {base_time / thread_time:.2f}x)")
+
+
+# ===================================== chained product: written order vs planned contraction
+
+a, b, c = (Vector(np.random.rand(*shape)) for shape in [(1000, 10), (10, 1000), (1000, 10)])
+
+def using_written_order():
+    return a @ b @ c
+
+def using_contract():
+    return Vector.contract("ij,jk,kl->il", a, b, c)
+
+written_time = timeit.timeit(using_written_order, number=20)
+contract_time = timeit.timeit(using_contract, number=20)
+
+print(f"a @ b @ c: {written_time}")
+print(f"Vector.contract: {contract_time}")
+
+
+# ===================================== autotype: cell by cell vs column by column
+
+rows = [(k, k * 0.5, str(k % 100), k % 2 == 0) for k in range(100000)]
+
+def using_autotype():
+    return [[autotype(cell) for cell in row] for row in rows]
+
+def using_autotype_columns():
+    return autotype_columns(rows)
+
+autotype_time = timeit.timeit(using_autotype, number=1)
+autotype_columns_time = timeit.timeit(using_autotype_columns, number=1)
+
+print(f"autotype per cell: {autotype_time}")
+print(f"autotype_columns: {autotype_columns_time}")
+
+
+# ===================================== String: s = s + piece for 10^5 pieces
+
+pieces = [str(k % 10) for k in range(100000)]
+
+def using_string_concat():
+    s = String("")
+    for piece in pieces:
+        s = s + piece
+    return str(s)
+
+def using_str_join():
+    return "".join(pieces)
+
+string_concat_time = timeit.timeit(using_string_concat, number=1)
+str_join_time = timeit.timeit(using_str_join, number=1)
+
+print(f"String + (10^5 pieces): {string_concat_time}")
+print(f"str.join (10^5 pieces): {str_join_time}")
+
+
+# ===================================== 10^6 binary records: struct loop vs RecordType
+import struct
+
+Packet = RecordType([("kind", UnsignedInteger8), ("length", Integer16),
+                     ("id", UnsignedInteger32), ("level", Real32)], byteorder="big")
+data = struct.pack(">BhIf", 1, -2, 70000, 0.5) * 1000000
+
+def using_struct():
+    return sum(length for _, length, _, _ in struct.iter_unpack(">BhIf", data))
+
+def using_records():
+    return Packet.from_buffer(data)["length"].sum(dtype=np.int64)
+
+struct_time = timeit.timeit(using_struct, number=1)
+records_time = timeit.timeit(using_records, number=1)
+
+print(f"struct.iter_unpack: {struct_time}")
+print(f"RecordType.from_buffer: {records_time}")
+
+
+# ===================================== serialization: pickle vs dump_many/load_many
+import io
+import pickle
+
+scalars = [Real(k * 0.5) for k in range(100000)]
+matrix = Vector(np.random.rand(1000, 1000))
+
+def using_pickle():
+    return pickle.loads(pickle.dumps(scalars)), pickle.loads(pickle.dumps(matrix))
+
+def using_codec():
+    stream = io.BytesIO()
+    dump_many(scalars, stream)
+    dump_many([matrix], stream)
+    stream.seek(0)
+    return list(load_many(stream))
+
+pickle_time = timeit.timeit(using_pickle, number=1)
+codec_time = timeit.timeit(using_codec, number=1)
+
+print(f"pickle: {pickle_time} ({len(pickle.dumps(scalars))} bytes for the scalars)")
+print(f"dump_many/load_many: {codec_time} ({9 * len(scalars)} bytes for the scalars)")
+
+
+# ===================================== np.add parity: typed operands vs raw numpy
+
+a, b = Real(1.919), Real(2.919)
+v, w = Vector(np.random.rand(1000)), Vector(np.random.rand(1000))
+raw_v, raw_w = v.value, w.value
+
+def using_np_add_real():
+    return np.add(a, b)
+
+def using_np_add_float():
+    return np.add(1.919, 2.919)
+
+def using_np_add_vector():
+    return np.add(v, w)
+
+def using_np_add_ndarray():
+    return np.add(raw_v, raw_w)
+
+print(f"np.add(Real, Real): {timeit.timeit(using_np_add_real, number=10000)} -> {type(using_np_add_real()).__name__}")
+print(f"np.add(float, float): {timeit.timeit(using_np_add_float, number=10000)}")
+print(f"np.add(Vector, Vector): {timeit.timeit(using_np_add_vector, number=10000)} -> {type(using_np_add_vector()).__name__}")
+print(f"np.add(ndarray, ndarray): {timeit.timeit(using_np_add_ndarray, number=10000)}")
@@ -1,3 +1,12 @@
+import io
+import math
+import operator
+import os
+import struct
+import tempfile
+import tracemalloc
+import warnings
+
 from data_type import *
 
 
@@ -869,6 +878,812 @@ def test_type():
 
 
 
+def test_fixed_width():
+    assert uint8(255) + uint8(1) == 0
+    assert int8(127) + int8(1) == -128
+    assert uint8(-1) == 255
+    assert int16(40000) == -25536
+    assert uint64(-1) == 2 ** 64 - 1
+    a = uint8(250)
+    a += 10
+    assert a == 4
+    assert type(a) == UnsignedInteger8
+    assert -uint8(5) == 251
+    assert Real32(1.1) == float(np.float32(1.1))
+    assert Complex64(1.1 + 2.2j) == complex(np.complex64(1.1 + 2.2j))
+    assert type(Integer(1).raw_value) == int
+    assert type(Real(1.0).raw_value) == float
+    assert Integer(1).value.dtype == np.int64
+    assert Real(1.0).value.dtype == np.float64
+    # the numpy semantics of the old 0-d array storage
+    assert Integer(2 ** 63 - 1) + 1 == -2 ** 63
+    assert Complex(1 + 2j) < Complex(2)
+    assert Complex(2) < Complex(2 + 1j)
+    assert Complex(2 + 1j) >= 2
+    assert not Complex(3) <= Complex(2 + 5j)
+    assert np.isnan(float(Real(-1.0) ** 0.5))
+    assert np.isnan(float(Real(-8.0) ** Real(1 / 3)))
+    assert type(Real(-1.0) ** 0.5) == Real
+    assert Real(0.0) ** -1 == float("inf")
+    a = Real(-1.0)
+    a **= 0.5
+    assert np.isnan(float(a))
+    # a native complex operand keeps the left type and drops the imaginary part, as numpy did
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert type(Real(1.0) + 2j) is Real and Real(1.0) + 2j == 1.0
+        assert type(Integer(1) * 2j) is Integer and 2j - Real(1.0) == -1.0
+    assert caught and caught[0].category is np.exceptions.ComplexWarning
+    assert type(Real(1.0) + Complex(2j)) is Complex
+    try:
+        a += 2j
+        assert False, "a Real cannot hold a complex result"
+    except TypeError:
+        assert np.isnan(float(a))
+
+
+def test_cast_table():
+    samples = [Boolean(True), Integer(3), int8(-3), int16(3), int32(3), int64(3),
+               uint8(3), uint16(3), uint32(3), uint64(3), Real(1.5), Real32(1.5), Real64(1.5),
+               Complex(1 + 2j), Complex64(1 + 2j), Complex128(1 + 2j), Vector([1, 2]),
+               2, True, 2.5, 1 + 1j, [1, 2]]
+    for left in samples:
+        if not isinstance(left, Number):
+            continue
+        for right in samples:
+            try:
+                expected = left._cast_fallback(right)
+            except (TypeError, ValueError, DeferredOperand) as e:
+                expected = type(e)
+            try:
+                result = left.cast(right)
+            except (TypeError, ValueError, DeferredOperand) as e:
+                result = type(e)
+            if isinstance(expected, type):
+                assert result is expected
+                continue
+            assert [type(x) for x in result] == [type(x) for x in expected]
+            assert all(np.array_equal(x.value, y.value) for x, y in zip(result, expected))
+            assert CAST_TABLE[type(left), type(right)][1] is type(result[0])
+
+
+def test_slots():
+    for value in [Boolean(True), Integer(1), uint8(1), Real(1.0), Real32(1.0), Complex(1 + 2j),
+                  Complex64(1 + 2j), Vector([1, 2]), String("a"), Tuple((1, 2))]:
+        assert not hasattr(value, "__dict__")
+    c = Complex(1 + 2j)
+    assert c.real == Real(1.0)
+    assert c.imag == Real(2.0)
+    assert type(c.imag) == Real
+    assert Integer(5).raw_value == 5
+    g = Generic(5)
+    assert g.value == 5
+    assert repr(g) == "Generic(5)"
+    assert not hasattr(g, "__dict__")
+
+
+def test_typed_array():
+    a = uint8_array([255, 200, 0, -1])
+    assert a.dtype == np.uint8
+    assert (a == [255, 200, 0, 255]).all() == True
+    assert (a + 1 == [0, 201, 1, 0]).all() == True
+    assert (a + uint8(1) == [0, 201, 1, 0]).all() == True
+    assert (a + 1000 == [int(uint8(x) + 1000) for x in [255, 200, 0, 255]]).all() == True
+    assert (1000 - a == [int(1000 - uint8(x)) for x in [255, 200, 0, 255]]).all() == True
+    assert (a + int16_array([300, 1, 1, 1])).dtype == np.uint8
+    assert (a // 7 == [36, 28, 0, 36]).all() == True
+    assert (a % 7 == [3, 4, 0, 3]).all() == True
+    assert (a << 1 == [254, 144, 0, 254]).all() == True
+    assert (a >> 1 == [127, 100, 0, 127]).all() == True
+    assert (a & 0xF == [15, 8, 0, 15]).all() == True
+    assert (a | 1 == [255, 201, 1, 255]).all() == True
+    assert (a ^ 0xFF == [0, 55, 255, 0]).all() == True
+    assert (int8_array([127]) + int8(1) == [-128]).all() == True
+    assert (a + 0.5).dtype == np.float64
+    # Python ints beyond 64 bits wrap there first, like Integer
+    assert ((a + 2**64) == a).all() == True and ((a + (2**64 + 1)) == a + 1).all() == True
+    assert (a * 2**70 == 0).all() == True and (a + 2**64).dtype == np.uint8
+    # a scalar on the left is the Vector's reflected operator
+    assert type(uint8(1) + a) is Vector and (uint8(1) + a).dtype == np.uint8
+    assert (uint8(1) + a == [0, 201, 1, 0]).all() == True
+    assert (Integer(1000) - a == 1000 - a).all() == True and (Real(0.5) * a == a * 0.5).all() == True
+    assert (int8(1) < a).all() == False and (uint8(200) == a).any() == True
+    assert (a ** 2).dtype == np.uint8 and (uint8_array([3, 20]) ** 2 == [9, 144]).all() == True
+    assert (2 ** int8_array([1, 7]) == [2, -128]).all() == True
+    power = Real(2.0)
+    power **= Vector([1.0, 2.0])  # rebinds to the Vector the reflected operator returns
+    assert type(power) is Vector and (power == [2.0, 4.0]).all() == True
+
+    buffer = bytearray(b"\x01\x02\x03\x04\xff\xff")
+    b = UnsignedInteger8.array_from_buffer(buffer)
+    assert b.dtype == np.uint8 and len(b) == 6
+    buffer[0] = 9
+    assert b[0] == 9  # shares memory with the buffer
+    c = Integer16.array_from_buffer(memoryview(buffer), shape=(3,))
+    assert c.dtype == np.int16 and c[2] == -1
+    floats = np.array([1.5, -2.0], dtype=np.float32).tobytes()
+    assert (Real32.array_from_buffer(floats) == [1.5, -2.0]).all() == True
+    for cls in (Boolean, Real, Real32, Real64, Complex, Complex64, Complex128):
+        assert cls.array_from_buffer(bytes(16)).dtype == cls.dtype
+    assert Complex64.array([1 + 2j]).dtype == np.complex64
+    try:
+        Vector.array_from_buffer(buffer)
+        assert False
+    except TypeError:
+        assert True
+    d = Vector.from_buffer(bytes(buffer), dtype=np.uint8, shape=(2, 3), offset=0)
+    assert d.shape == (2, 3) and (d + 1).dtype == np.uint8
+    assert Vector.from_buffer(buffer, offset=4).shape == (2,)
+
+
+def test_interning():
+    enable_interning(-5, 256)
+    try:
+        assert Integer(1) is Integer(1)
+        assert Boolean(True) is Boolean(1)
+        assert uint8(7) is uint8(7)
+        assert uint8(7) is not Integer(7)
+        assert Integer(1000) is not Integer(1000)
+        a = Integer(1)
+        a += 1
+        assert a == 2
+        assert Integer(1) == 1
+        b = Boolean(False)
+        b //= True
+        assert Boolean(False) == False
+        assert uint8(-1) == 255
+        cached = Integer(1)
+        for name in ("value", "raw_value"):
+            try:
+                setattr(cached, name, 7)
+                assert False, "a cached instance must not change"
+            except AttributeError:
+                pass
+        assert Integer(1) == 1
+        for wrapped in (int8(200), uint8(-1)):  # cached under 200 and -1, holding -56 and 255
+            try:
+                wrapped.value = 5
+                assert False, "a cached instance must not change"
+            except AttributeError:
+                pass
+        assert int8(200) == -56 and uint8(-1) == 255
+        c = Integer(1000)
+        c.value = 7
+        assert c == 7
+    finally:
+        disable_interning()
+    assert Integer(1) is not Integer(1)
+    assert "__call__" not in Interned.__dict__
+    d = Integer(1)
+    d.value = 7
+    assert d == 7
+
+
+def test_lazy():
+    a = Vector([1.0, 2.0, 3.0])
+    b = Vector([4.0, 5.0, 6.0])
+    c = Vector([1.0, 2.0, 4.0])
+    d = Vector([2.0, 2.0, 2.0])
+    e = a.lazy() * b + c / d
+    assert isinstance(e, LazyVector)
+    assert e.result is None
+    assert (e == a * b + c / d).all() == True
+    assert e[1] == 11.0
+    t = a.lazy() * 2
+    x = t + 1
+    y = t - 1
+    assert (x == [3.0, 5.0, 7.0]).all() == True
+    assert (y == [1.0, 3.0, 5.0]).all() == True
+    u = uint8_array([250, 5]).lazy()
+    assert (u + 10).dtype == np.uint8
+    assert ((u + 10) == [4, 15]).all() == True
+    assert ((1000 - u) == [238, 227]).all() == True
+    assert ((u * 2 + 1 > 100) == [True, False]).all() == True
+    assert (Vector([1, 2]) + Vector([3, 4]).lazy()).result is None
+    # shared subexpressions are computed once, deep chains do not recurse
+    s = Vector([1.0, 2.0]).lazy()
+    for _ in range(200):
+        s = s + s
+    assert s[0] == 2.0 ** 200
+    p = a.lazy() * 2
+    q = (p + 1) * (p - 1) + p
+    assert (q == [5.0, 19.0, 41.0]).all() == True
+    chain = Vector([0, 1]).lazy()
+    for _ in range(10000):
+        chain = chain + 1
+    assert chain[1] == 10001
+    # every Vector in the tree is taken when the expression is built, not when it is evaluated
+    f, g = Vector([1, 2]), Vector([1, 2])
+    h = f.lazy() + g
+    k = g - f.lazy()
+    f[0] = 100
+    g[0] = 500
+    assert (h == [2, 4]).all() == True and (k == [0, 0]).all() == True
+
+
+def test_vectorize():
+    @vectorize
+    def term(k):
+        return (-1) ** k * (2 * k + 1) / (2 * k + 1)
+
+    @vectorize
+    def mixed(x, y):
+        return Real(0.5) * x + Integer(1) - y / 2
+
+    assert len(term.trace) == 7
+    assert (term(np.arange(4)) == [1.0, -1.0, 1.0, -1.0]).all() == True
+    assert (mixed([1.0, 2.0], Vector([4.0, 6.0])) == [-0.5, -1.0]).all() == True
+    assert mixed(Real(2.0), Real(4.0)) == Real(0.0)
+
+    # typed constants and result types match the scalar loop
+    @vectorize
+    def shift(k):
+        return UnsignedInteger8(250) + k
+
+    @vectorize
+    def half(k):
+        return k // 2
+
+    ks = np.arange(1, 10)
+    for vectorized, expected in [(shift, [UnsignedInteger8(250) + Integer64(k) for k in ks]),
+                                 (half, [Integer64(k) // 2 for k in ks])]:
+        result = vectorized(ks)
+        assert result.dtype == ARRAY_DTYPES[type(expected[0])]
+        assert result.value.tolist() == [value.raw_value for value in expected]
+    assert (shift(uint8_array([250, 3])) == [244, 253]).all() == True
+    assert type(shift(Integer(10))) == UnsignedInteger8
+
+    # the result array is kept, not copied; an argument handed back is still copied
+    @vectorize
+    def step(x):
+        return x + 1
+
+    @vectorize
+    def same(x):
+        return x
+
+    big = np.ones(1000000)
+    tracemalloc.start()
+    step(big)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 1.5 * big.nbytes
+
+    source = Vector([1, 2])
+    copied = same(source)
+    copied[0] = 9
+    assert source[0] == 1 and copied[0] == 9
+    try:
+        @vectorize
+        def branch(x):
+            return x if x > 0 else -x
+        assert False
+    except TypeError:
+        assert True
+
+
+def test_profile():
+    add = Number.__add__
+    with profile() as p:
+        a = Real(1.0)
+        for _ in range(10):
+            a = a + Integer(2)
+        v = uint8_array([1, 2, 3]) + 1
+    assert Number.__add__ is add
+    entry = p.stats["__add__", "Real", "Integer"]
+    assert entry["calls"] == 10
+    assert entry["coercion"] > 0 and entry["construction"] > 0
+    assert p.stats["__add__", "Vector", "int"]["numpy"] > 0
+    assert "__add__" in p.report()
+    from_raw = Number.__dict__["_from_raw"]
+    with profile() as p:
+        b = Real(1.0) + Real(2.0)
+    assert Number.__dict__["_from_raw"] is from_raw
+    assert b == 3.0
+    assert p.stats["__add__", "Real", "Real"]["construction"] > 0
+
+
+def test_from_raw():
+    # results built by the operators match what the public constructors give
+    assert type(Integer(2) + 3) is Integer and (Integer(2) + 3).raw_value == 5
+    assert type((Integer(2) + Real(2.0)).raw_value) is float
+    assert (Boolean(True) + Boolean(True)).raw_value == 1
+    assert (Integer(3) < Integer(4)).raw_value == 1
+    assert (uint8(250) + uint8(10)).raw_value == 4
+    assert Real32._from_raw(0.1).raw_value == Real32(0.1).raw_value
+    assert type(Integer._from_raw(2.5)) is Integer and Integer._from_raw(2.5).raw_value == 2
+
+    # Vector results are not copied again, but never alias an operand
+    a = Vector([1, 2, 3])
+    b = -a
+    assert b.raw_value is not a.raw_value
+    c = +a
+    c[0] = 9
+    assert a[0] == 1
+    array = np.arange(3)
+    assert Vector._from_raw(array).raw_value is array
+
+    enable_interning()
+    try:
+        assert Integer(1) + 2 is Integer(3)
+    finally:
+        disable_interning()
+
+
+def test_mmap():
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.bin")
+        target = os.path.join(directory, "target.bin")
+        a = Vector.open_mmap(source, dtype=np.int16, shape=(2, 3), mode="w+")
+        a[0] = [1, 2, 3]
+        a[1] = [4, 5, 6]
+        a.flush()
+        assert isinstance(a.value, np.memmap)
+
+        b = Vector.open_mmap(source, dtype=np.int16, shape=(2, 3), mode="r")
+        assert (b + 1 == [[2, 3, 4], [5, 6, 7]]).all() == True
+        assert ((b > 3) == [[False, False, False], [True, True, True]]).all() == True
+        assert (b.T.dot(b).value == b.value.T @ b.value).all()
+        assert b[1, 2] == 6
+
+        out = Vector.open_mmap(target, dtype=np.int16, shape=(2, 3), mode="w+")
+        assert b.apply(np.multiply, 10, out=out) is out
+        out.flush()
+        del out
+        c = Vector.open_mmap(target, dtype=np.int16, shape=(2, 3), mode="r")
+        assert (c == [[10, 20, 30], [40, 50, 60]]).all() == True
+        assert (b.apply(np.add, b) == [[2, 4, 6], [8, 10, 12]]).all() == True
+        del a, b, c
+
+
+def test_threading():
+    a = Vector(np.arange(1000) % 256, dtype=np.uint8)
+    b = Vector(np.linspace(1, 2, 1000))
+    m = Vector(np.arange(3000.0).reshape(1000, 3))
+    expected = [a + 100, a * a, b / 3, 2 / b, a < 128, b == b, m + Vector([1.0, 2.0, 3.0]), (a.lazy() + 1) * 2]
+    enable_threading(4, threshold=100)
+    try:
+        threaded = [a + 100, a * a, b / 3, 2 / b, a < 128, b == b, m + Vector([1.0, 2.0, 3.0]), (a.lazy() + 1) * 2]
+        out = Vector(np.empty(1000))
+        assert b.apply(np.multiply, b, out=out) is out
+        assert np.allclose(out.value, b.value * b.value)
+        assert (Vector([1, 2]) + 1 == [2, 3]).all() == True  # below the threshold
+    finally:
+        disable_threading()
+    for x, y in zip(expected, threaded):
+        assert x.dtype == y.dtype
+        assert np.array_equal(x.value, y.value)
+
+
+def leibniz_terms(start, stop):
+    p = real(0)
+    for k in range(int(start), int(stop)):
+        p += (-1) ** k / (2 * k + 1)
+    return p
+
+
+def test_parallel_map():
+    args = [(Integer(start), Integer(start + 100)) for start in range(0, 1000, 100)]
+    results = parallel_map(leibniz_terms, args, workers=2)
+    assert all(type(result) is Real for result in results)
+    assert results == [leibniz_terms(*row) for row in args]
+    assert abs(4 * sum(float(result) for result in results) - math.pi) < 1e-2
+
+    wrapped = parallel_map(operator.add, [(uint8(250), uint8(10)), (real32(0.1), real32(0.2))], workers=2, batch_size=1)
+    assert type(wrapped[0]) is UnsignedInteger8 and wrapped[0] == 4
+    assert type(wrapped[1]) is Real32 and wrapped[1].raw_value == (real32(0.1) + real32(0.2)).raw_value
+    assert parallel_map(abs, [-1, Integer(-2), 2**70], workers=1) == [1, Integer(2), 2**70]
+    assert parallel_map(pow, [(2, 3), (2, 3, 5)], workers=1) == [8, 3]
+    assert parallel_map(abs, [], workers=1) == []
+
+
+def test_matmul():
+    a = Vector([[1, 2], [3, 4]])
+    b = Vector([[5, 6], [7, 8]])
+    assert ((a @ b).value == a.value @ b.value).all()
+    assert (([[1, 0], [0, 1]] @ a).value == a.value).all()
+    assert type(Vector([1, 2]) @ Vector([3, 4])) is Integer64
+    product = uint8_array([16, 1]) @ uint8_array([16, 2])
+    assert type(product) is UnsignedInteger8 and product == 2  # 256 + 2 wraps like the elements
+    assert (Vector([1.0, 2.0]) @ [3.0, 4.0]) == 11.0
+    assert (Vector(np.ones((4, 2, 3))) @ Vector(np.ones((4, 3, 5)))).shape == (4, 2, 5)  # batched
+
+    x, y, z = (Vector(np.random.rand(*shape)) for shape in [(50, 2), (2, 50), (50, 3)])
+    contraction_plan.cache_clear()
+    result = Vector.contract("ij,jk,kl->il", x, y, z)
+    assert np.allclose(result.value, x.value @ y.value @ z.value)
+    # (y @ z) first: the 50x50 intermediate of x @ y is never built
+    assert contraction_plan("ij,jk,kl->il", ((50, 2), (2, 50), (50, 3)))[1] == (1, 2)
+    Vector.contract("ij,jk,kl->il", x, y, Vector(np.random.rand(50, 4)))
+    assert contraction_plan.cache_info().misses == 2
+    Vector.contract("ij,jk,kl->il", x, y, z)
+    assert contraction_plan.cache_info().hits >= 2
+    assert type(Vector.contract("i,i->", [1.0, 2.0], [3.0, 4.0])) is Real64
+
+
+def test_memoized():
+    m = Vector([[2.0, 0.0], [0.0, 3.0]])
+    assert m.rank == 2 and m.norm == math.sqrt(13)
+    assert m.eig() is m.eig()
+    norm = m.norm
+    norm += 1
+    assert m.norm == math.sqrt(13)
+
+    m[1, 1] = 0.0
+    assert m.rank == 1 and m.norm == 2.0
+    assert sorted(m.eig()[0]) == [0.0, 2.0]
+
+    m += 1.0
+    assert m.rank == 2 and m.norm == math.sqrt(9 + 1 + 1 + 1)
+    m.value = np.zeros((2, 2))
+    assert m.rank == 0
+    m.value[0, 0] = 5.0  # raw writes need an explicit mutated()
+    m.mutated()
+    assert m.norm == 5.0
+    m.apply(np.add, 1.0, out=m)
+    assert m.norm == math.sqrt(36 + 1 + 1 + 1)
+
+
+def test_inplace_vector():
+    a = Vector([1.0, 2.0, 3.0])
+    buffer = a.value
+    a += Vector([1.0, 1.0, 1.0])
+    a -= 0.5
+    a *= Real(2.0)
+    a /= Integer(3)
+    a **= 2
+    assert a.value is buffer
+    assert np.allclose(a.value, ((np.array([1.0, 2.0, 3.0]) + 0.5) * 2 / 3) ** 2)
+
+    b = uint8_array([250, 5, 0])
+    b += 10
+    b -= uint8(1)
+    assert (b == [3, 14, 9]).all() == True and b.dtype == np.uint8
+    b //= 2
+    b %= 5
+    b <<= 2
+    b >>= 1
+    b &= 0xF
+    b |= 1
+    b ^= np.array([1, 1, 1], dtype=np.uint8)
+    assert (b.value == np.array([2, 4, 8], dtype=np.uint8)).all()
+
+    c = Vector([1, 2, 3])
+    try:
+        c /= 2  # float64 -> int64 is not a same_kind cast
+        assert False
+    except TypeError:
+        pass
+    c += Vector(c.value[::-1])
+    assert (c == [4, 4, 4]).all() == True
+
+    lazy = a.lazy()
+    lazy += 1
+    assert isinstance(lazy, LazyVector) and a.value is buffer
+    assert np.allclose(lazy.value, a.value + 1)
+
+    big = Vector(np.zeros(1000000))
+    tracemalloc.start()
+    big += 1.0
+    big *= big
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 100000
+
+
+def test_views():
+    a = Vector(np.arange(6.0).reshape(2, 3))
+    row = a[1]
+    part = vec(a[:, 1:])
+    t = a.T
+    copy = +a
+    assert isinstance(row, Vector) and isinstance(part, Vector)
+    assert all(np.shares_memory(view.raw_value, a.raw_value) for view in (row, part, t, copy))
+    assert type(a[1, 2]) is np.float64 and isinstance(a[[0, 1]], Vector)
+
+    row[0] = 100.0  # the view copies its own three elements
+    assert row[0] == 100.0 and a[1, 0] == 3.0
+    assert not np.shares_memory(row.raw_value, a.raw_value)
+
+    buffer = a.raw_value
+    a[0, 0] = -1.0  # the owner keeps its buffer and copies the other views out
+    assert a.raw_value is buffer
+    assert part[0, 0] == 1.0 and t[0, 0] == 0.0 and copy[0, 0] == 0.0
+    assert not any(np.shares_memory(view.raw_value, a.raw_value) for view in (part, t, copy))
+
+    b = Vector([1, 2, 3])
+    c = b[1:]
+    c += 10
+    assert (b == [1, 2, 3]).all() == True and (c == [12, 13]).all() == True
+    d = b[:2]
+    b *= 2
+    assert (d == [1, 2]).all() == True and (b == [2, 4, 6]).all() == True
+
+    lazy = b.lazy()
+    b[0] = 0
+    assert lazy[0] == 2
+    e = b[1:]
+    e.value = np.zeros(2)
+    b[1] = 7  # nothing to copy: `e` no longer shares the buffer
+    assert (e.value == 0).all() and b[1] == 7
+
+    # dropped views leave the group right away, also when the owner is never written
+    m = Vector(np.zeros((100, 3)))
+    for k in range(10000):
+        m[k % 100]
+    assert len(m.shared) <= 2
+    views = [m[k] for k in range(100)]
+    assert len(m.shared) == 101
+    del views
+    assert len(m.shared) == 1 and len(m.shared.members) == 1
+
+    # an array handed out by `.value` or np.asarray may be written, so it is never shared
+    f = Vector([1, 2, 3])
+    g = Vector(f)
+    g.value[0] = 99
+    assert (f == [1, 2, 3]).all() == True and g[0] == 99
+    h = +f
+    np.asarray(h)[1] = 77
+    assert (f == [1, 2, 3]).all() == True and h[1] == 77
+    n = Vector([[1, 2], [3, 4]])
+    k = Vector(n)
+    next(iter(k))[0] = 0  # rows from iteration are views too
+    assert n[0, 0] == 1 and k[0, 0] == 0
+
+
+def test_reductions():
+    a = uint8_array([200, 100, 3])
+    total = a.sum()
+    assert type(total) is UnsignedInteger8 and total == (200 + 100 + 3) % 256
+    assert a.sum(dtype=np.int64) == 303
+    assert type(a.max()) is UnsignedInteger8 and a.max() == 200 and a.min() == 3
+    assert a.argmax() == 0 and a.count() == 3
+    assert type(a.mean()) is Real64 and a.mean() == 101.0
+    assert int8_array([100, 100]).prod() == int8(100) * int8(100)
+
+    m = Vector([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    assert type(m.sum()) is Real32 and m.sum() == 10.0
+    assert isinstance(m.sum(axis=0), Vector) and (m.sum(axis=0) == [4.0, 6.0]).all() == True
+    assert (m.max(axis=1) == [2.0, 4.0]).all() == True
+    assert (m.argmax(axis=0) == [1, 1]).all() == True
+    assert m.mean(dtype=np.float64) == 2.5
+    assert (Vector([[0, 1], [0, 0]]).count(axis=1) == [1, 0]).all() == True
+
+    assert Vector(np.ones(10) / 10).sum() == np.add.reduce(np.ones(10) / 10)
+    big = Vector(np.zeros(1000000, dtype=bool))
+    assert big.any() == False and Vector(np.zeros(5)).all() == False
+    big[10] = True
+    assert type(big.any()) is Boolean and big.any() == True and big.all() == False
+    assert Vector(np.ones((1000, 300))).all() == True
+    assert (Vector([[True, False], [True, True]]).all(axis=1) == [False, True]).all() == True
+    assert Vector(np.zeros(0)).all() == True and Vector(np.zeros(0)).any() == False
+
+
+def test_autotype_columns():
+    ids, prices, names, flags, deltas = autotype_columns(
+        [(1, 0.5, "a", True, 300), (2, 1.25, "bc", False, -5), (200, 3.0, "d", True, 7)])
+    assert ids.dtype == np.uint8 and (ids == [1, 2, 200]).all() == True
+    assert prices.dtype == np.float32
+    assert names.dtype.kind == "U" and names[1] == "bc"
+    assert flags.dtype == np.bool_
+    assert deltas.dtype == np.int16
+
+    records = autotype_columns([{"id": 1, "x": 0.1}, {"id": 2, "x": None}, {"id": -3}])
+    assert records["id"].dtype == np.int8
+    assert records["x"].dtype == np.float64 and np.isnan(records["x"][1]) and np.isnan(records["x"][2])
+    late = autotype_columns([{"a": 1}, {"a": 2, "b": 3.5}, {"c": 7, "a": 3}])  # keys missing from the first row
+    assert list(late) == ["a", "b", "c"] and late["a"].dtype == np.int8
+    assert np.isnan(late["b"][0]) and late["b"][1] == 3.5
+    try:
+        autotype_columns([{"a": "x"}, {}])
+        assert False, "a missing string cell has no value to stand in for it"
+    except TypeError:
+        pass
+    assert autotype_column([2**63]).dtype == np.uint64
+    assert autotype_column([1 + 2j, 0.5]).dtype == np.complex64
+    assert (autotype_column([1, 2]) + 1).dtype == np.int8
+    wide = autotype_column([-1, 2**63])
+    assert wide.dtype == object and wide.value.tolist() == [-1, 2**63]
+    assert autotype_column([2**70]).value.tolist() == [2**70]
+    for bad in ([1, "a"], [None], [[1]]):
+        try:
+            autotype_column(bad)
+            assert False
+        except TypeError:
+            pass
+    try:
+        autotype_column([None, "a"])
+        assert False
+    except TypeError as error:
+        assert "NoneType" in str(error) and "str" in str(error)
+
+
+def test_string_rope():
+    s = String("")
+    for k in range(1000):
+        s = s + str(k % 10)
+    assert s.count == 1001 and s.text is None  # nothing joined yet
+    assert len(s) == 1000 and str(s) == "0123456789" * 100
+    assert s.chunks is None and s.text is not None  # joined once, then held as plain text
+
+    a = String("ab")
+    assert a.chunks is None  # no chunk list until the first `+`
+    b = a + "c"
+    c = a + "d"  # `b` already extended the shared list
+    assert b == "abc" and c == "abd" and a == "ab"
+    assert "x" + a + String("y") == "xaby"
+    assert type("x" + a) is String
+    assert (a < "b") == True and (a >= String("ab")) == True and (a != "ab") == False
+    assert hash(b) == hash("abc") and {b: 1}[String("abc")] == 1
+
+
+def test_string_vector():
+    ids = string_array(["a1", "b22", String("c333")])
+    assert ids.dtype.kind == "U" and len(ids) == 3
+    tagged = ids + "-x"
+    assert type(tagged) is StringVector and list(tagged.value) == ["a1-x", "b22-x", "c333-x"]
+    assert list(("#" + ids).value) == ["#a1", "#b22", "#c333"]
+    assert list((ids + ids).value) == ["a1a1", "b22b22", "c333c333"]
+    same = ids == ["a1", "zz", "c333"]
+    assert type(same) is Vector and same.dtype == np.bool_ and list(same.value) == [True, False, True]
+    assert list((ids < String("b5")).value) == [True, True, False]
+    assert "b22" in ids and String("a1") in ids and "zz" not in ids
+    assert list(ids.lengths().value) == [2, 3, 4]
+    assert isinstance(ids[1:], StringVector) and ids[0] == "a1"
+
+    ids += "!"
+    assert list(ids.value) == ["a1!", "b22!", "c333!"]
+    variable = StringVector(["a", "bb"], dtype=np.dtypes.StringDType())
+    assert list((variable + "c").value) == ["ac", "bbc"]
+    try:
+        ids - "a"
+        assert False
+    except TypeError:
+        pass
+    assert type(autotype_columns([("x",), ("yy",)])[0]) is StringVector
+
+    enable_threading(2, threshold=4)
+    try:
+        column = string_array(["a", "bb", "c", "d", "e", "f"])
+        assert list((column + "x").value) == ["ax", "bbx", "cx", "dx", "ex", "fx"]
+        assert list(("#" + column).value)[:2] == ["#a", "#bb"]
+        assert list((column == "a").value) == [True] + [False] * 5
+        assert list((column + np.str_("y")).value)[1] == "bby"
+    finally:
+        disable_threading()
+
+
+def test_records():
+    Packet = RecordType([("kind", UnsignedInteger8), ("length", Integer16),
+                         ("id", UnsignedInteger32), ("level", Real32)], byteorder="big")
+    assert Packet.itemsize == 11
+    data = bytearray(struct.pack(">BhIf", 1, -2, 70000, 0.5) + struct.pack(">BhIf", 2, 300, 5, 1.25))
+    packets = Packet.from_buffer(data)
+    assert len(packets) == 2
+    lengths = packets["length"]
+    assert isinstance(lengths, Vector) and list(lengths.value) == [-2, 300]
+    assert (packets["level"] * 2 == [1.0, 2.5]).all() == True
+    # a big-endian column reduces in native order and keeps its element type
+    assert type(lengths.sum()) is Integer16 and lengths.sum() == 298 and lengths.prod() == -600
+    assert type(lengths.max()) is Integer16 and lengths.max() == 300
+
+    first = packets[0]
+    assert isinstance(first, Tuple) and len(first) == 4
+    assert type(first["id"]) is UnsignedInteger32 and first["id"] == 70000
+    assert type(first[3]) is Real32 and first[3] == 0.5
+    assert [int(field) for field in packets[1]][:3] == [2, 300, 5]
+
+    first["kind"] = 257  # wraps like uint8(257)
+    packets[1]["length"] = Integer16(-7)
+    assert data[0] == 1 and struct.unpack(">h", data[12:14])[0] == -7  # written into the buffer
+    assert len(packets[1:]) == 1 and packets[1:][0]["length"] == -7
+
+    little = RecordType([("a", Integer8), ("b", UnsignedInteger16)], byteorder="little")
+    records = little.from_buffer(b"\xff\x01\x02" * 3, count=2)
+    assert len(records) == 2 and records[1]["a"] == -1 and records[1]["b"] == 0x0201
+    built = little.array([(1, 2), (Integer8(3), 65536 + 4)])
+    assert list(built["b"].value) == [2, 4] and bytes(built) == b"\x01\x02\x00\x03\x04\x00"
+
+
+def test_serialization():
+    values = [Boolean(True), Integer(-5), Integer(-2**63), Integer(2**63 - 1), int8(-3), uint16(65535), uint64(2**64 - 1),
+              Real(0.1), real32(0.1), Complex(1 - 2j), Complex64(0.5 + 0.25j), String("héllo"),
+              Vector([[1.0, 2.0], [3.0, 4.0]]), uint8_array([1, 2, 255]), string_array(["a", "bcd"]),
+              Vector(np.zeros(0, dtype=np.int32))]
+    for value in values:
+        data = value.to_bytes() if isinstance(value, Number) else to_bytes(value)
+        decoded = from_bytes(data)
+        assert type(decoded) is type(value)
+        if isinstance(value, Vector):
+            assert decoded.dtype == value.dtype and np.array_equal(decoded.value, value.value)
+        else:
+            assert decoded.value == value.value
+    assert bytes(Integer(5)) == b"\x01\x05" + bytes(7)  # fixed width like Integer64
+    assert len(uint8(7).to_bytes()) == 2 and len(Real(1.0).to_bytes()) == 9
+    assert Integer8.from_bytes(int8(4).to_bytes()) == 4
+
+    big_endian = Vector(np.array([1, 2], dtype=">i4"))
+    assert from_bytes(to_bytes(big_endian)).dtype == np.dtype("<i4")
+    assert from_bytes(to_bytes(Vector([1.0, 2.0]).lazy() + 1)).shape == (2,)
+
+    stream = io.BytesIO()
+    dump_many(values, stream)
+    stream.seek(0)
+    loaded = list(load_many(stream))
+    assert [type(value) for value in loaded] == [type(value) for value in values]
+
+    for bad in (b"", b"\xff", Real(1.0).to_bytes()[:-1], Real(1.0).to_bytes() + b"\x00",
+                to_bytes(Vector([1, 2]))[:-1]):
+        try:
+            from_bytes(bad)
+            assert False
+        except (EOFError, ValueError):
+            pass
+    try:
+        Integer.from_bytes(Real(1.0).to_bytes())
+        assert False
+    except CastError:
+        pass
+
+    # headers are checked before anything is allocated
+    header = bytes((SERIAL_TAGS[Vector], 3)) + b"<f8" + bytes((2,))
+    for bad in (header + SERIAL_DIMENSION.pack(1 << 20) * 2,
+                bytes((SERIAL_TAGS[Vector], 3)) + b"|O8" + bytes((1,)) + SERIAL_DIMENSION.pack(1) + bytes(8)):
+        try:
+            from_bytes(bad)
+            assert False
+        except (EOFError, ValueError):
+            pass
+    assert bytes(String("héllo")) == to_bytes(String("héllo"))
+    assert from_bytes(bytes(String("a"))) == "a"
+
+
+def test_numpy_protocols():
+    total = np.add(Real(1.5), Real(2.0))
+    assert type(total) is Real and total == 3.5
+    assert type(np.add(uint8(250), uint8(10))) is UnsignedInteger8 and np.add(uint8(250), uint8(10)) == 4
+    assert type(np.multiply(Integer(3), Integer(4))) is Integer
+    assert type(np.add(real32(0.5), real32(0.25))) is Real32
+    assert np.asarray(uint8(3)).dtype == np.uint8 and np.asarray(Real(1.0)).dtype == np.float64
+
+    v = Vector([1.0, 2.0, 3.0])
+    assert np.asarray(v) is v.value and np.array(v) is not v.value
+    assert type(np.add(v, 1)) is Vector and type(np.array([1.0, 1.0, 1.0]) + v) is Vector
+    assert (np.array([1.0, 1.0, 1.0]) - v == [0.0, -1.0, -2.0]).all() == True
+    assert type(np.sqrt(v)) is Vector and type(np.sum(v)) is Real64 and np.sum(v) == 6.0
+    assert type(np.concatenate([v, [4.0]])) is Vector
+    assert type(np.add.reduce(uint8_array([200, 100]))) is UnsignedInteger64  # numpy widens, unlike Vector.sum
+    quotient, remainder = np.divmod(Vector([5, 7]), 3)
+    assert list(quotient.value) == [1, 2] and list(remainder.value) == [2, 1]
+    eigenvalues, eigenvectors = np.linalg.eig(Vector([[1.0, 0.0], [0.0, 2.0]]))
+    assert type(eigenvalues) is Vector and type(eigenvectors) is Vector
+    assert np.shape(v) == (3,) and np.array_equal(v, [1.0, 2.0, 3.0])
+    assert type(np.add(string_array(["a"]), "b")) is StringVector
+
+    out = Vector(np.zeros(3))
+    view = out[:]
+    assert np.multiply(v, 2, out=out) is out and (out == [2.0, 4.0, 6.0]).all() == True
+    assert (view == 0.0).all() == True  # `out` was written copy-on-write
+
+    m = Vector([[3.0, 0.0], [0.0, 4.0]])
+    norm = m.norm
+    transposed, flat = np.transpose(m), np.ravel(m)
+    transposed[0, 0] = 100.0
+    flat[3] = 100.0
+    assert m[0, 0] == 3.0 and m[1, 1] == 4.0 and m.norm == norm
+    counts = Vector([0, 0, 0])
+    before = counts[:]
+    assert counts.norm == 0.0
+    np.add.at(counts, [0, 0, 2], 1)
+    assert list(counts.value) == [2, 0, 1] and list(before.value) == [0, 0, 0]
+    assert np.isclose(counts.norm, 5 ** 0.5)
+    try:
+        np.add(v, String("a"))
+        assert False
+    except TypeError:
+        pass
+
+
 if __name__ == "__main__":
     test()
     test_Integer()
@@ -881,6 +1696,29 @@ if __name__ == "__main__":
     test_inplace()
     test_bitwise()
     test_cast()
+    test_fixed_width()
+    test_cast_table()
+    test_slots()
+    test_typed_array()
+    test_interning()
+    test_lazy()
+    test_vectorize()
+    test_profile()
+    test_from_raw()
+    test_mmap()
+    test_threading()
+    test_parallel_map()
+    test_matmul()
+    test_memoized()
+    test_inplace_vector()
+    test_views()
+    test_reductions()
+    test_autotype_columns()
+    test_string_rope()
+    test_string_vector()
+    test_records()
+    test_serialization()
+    test_numpy_protocols()
     print("All tests passed.")
     a = Integer(1)
     a += Integer(1)